@@ -0,0 +1,374 @@
+"""
+Benchmarks for the engine's core paths, on synthetic OHLC data (no network).
+
+    python -m benchmarks.bench_engine                      # quick preset
+    python -m benchmarks.bench_engine --preset full        # 1k..1M bars, 8..500 feeds
+    python -m benchmarks.bench_engine -o after.json --baseline before.json
+
+Every case reports bars/sec and peak traced memory (tracemalloc, which also
+sees numpy allocations). Results are written as JSON; with --baseline each
+case is printed next to the matching case of an earlier run.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import mytrader as bt
+from functions.inverted_holdings_logger import InvertedHoldingsLog
+from mytrader.broker import Broker
+from mytrader.order import Order
+
+PRESETS = {
+    "quick": dict(
+        bars=[1_000, 10_000],
+        feeds=[8, 50],
+        indicators=[1, 4],
+        feed_scaling_bars=1_000,
+        indicator_scaling_bars=5_000,
+    ),
+    "full": dict(
+        bars=[1_000, 10_000, 100_000, 1_000_000],
+        feeds=[8, 50, 500],
+        indicators=[1, 4, 16],
+        feed_scaling_bars=2_000,
+        indicator_scaling_bars=20_000,
+    ),
+}
+
+
+# =========================
+# Synthetic data
+# =========================
+def synthetic_frame(nbars, seed=0, freq="B"):
+    """Geometric random walk OHLCV frame, normalized like download_with_retry."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, nbars)))
+    open_ = close * (1.0 + rng.normal(0.0, 0.003, nbars))
+    high = np.maximum(open_, close) * (1.0 + np.abs(rng.normal(0.0, 0.005, nbars)))
+    low = np.minimum(open_, close) * (1.0 - np.abs(rng.normal(0.0, 0.005, nbars)))
+    volume = rng.integers(100_000, 1_000_000, nbars).astype(float)
+
+    index = pd.date_range("1990-01-01", periods=nbars, freq=freq, name="datetime")
+    return pd.DataFrame(
+        dict(open=open_, high=high, low=low, close=close, volume=volume),
+        index=index,
+    )
+
+
+def synthetic_feeds(nbars, nfeeds):
+    return {f"F{k:03d}": synthetic_frame(nbars, seed=k) for k in range(nfeeds)}
+
+
+# =========================
+# Benchmark strategy
+# =========================
+class RotationStrategy(bt.Strategy):
+    """Every ``every`` bars, hold the feed with the highest RSI (if above its SMA)."""
+
+    params = dict(period=20, indicators=1, every=5, hlog=None)
+
+    def __init__(self):
+        self.smas = []
+        self.rsis = []
+        for d in self.datas:
+            for k in range(self.p.indicators):
+                self.smas.append((d, bt.ind.SMA(d, period=self.p.period + k)))
+            self.rsis.append((d, bt.ind.RSI(d, period=14)))
+        self.bar = 0
+        self.held = None
+
+    def next(self):
+        self.bar += 1
+
+        if self.p.hlog is not None:
+            self.p.hlog.collect(self, assets=["CASH"] + self.datas)
+
+        if self.bar % self.p.every:
+            return
+
+        # read every indicator, like a real strategy would
+        above = {d for d, sma in self.smas if d.close[0] > sma[0]}
+        best, best_rsi = None, -1.0
+        for d, rsi in self.rsis:
+            v = rsi[0]
+            if d in above and v > best_rsi:
+                best, best_rsi = d, v
+
+        if best is not self.held:
+            if self.held is not None:
+                self.close(self.held)
+            if best is not None:
+                self.order_target_percent(best, 1.0)
+            self.held = best
+
+
+def build_cerebro(frames, **params):
+    cerebro = bt.Cerebro(cash=100_000.0)
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name="dd")
+    cerebro.addanalyzer(bt.analyzers.Returns, _name="returns")
+    for name, df in frames.items():
+        cerebro.adddata(bt.feeds.PandasData(dataname=df), name=name)
+    cerebro.addstrategy(RotationStrategy, **params)
+    return cerebro
+
+
+# =========================
+# Cases: setup, then return the callable to time. The callable returns the
+# number of bars it processed (optionally with a dict of extra figures).
+# =========================
+def case_line_getitem(nbars):
+    data = bt.feeds.PandasData(dataname=synthetic_frame(nbars))
+    close = data.close
+
+    def run():
+        for i in range(nbars):
+            data.idx = i
+            close[0]
+            close[-1]
+        return nbars
+
+    return run
+
+
+def _indicator_case(cls, nbars, precompute, **kwargs):
+    data = bt.feeds.PandasData(dataname=synthetic_frame(nbars))
+
+    def run():
+        ind = cls(data, **kwargs)
+        ind.precompute = precompute
+        for i in range(nbars):
+            data.idx = i
+            ind[0]
+        return nbars
+
+    return run
+
+
+def case_sma_precompute(nbars):
+    return _indicator_case(bt.ind.SMA, nbars, True, period=200)
+
+
+def case_sma_streaming(nbars):
+    return _indicator_case(bt.ind.SMA, nbars, False, period=200)
+
+
+def case_rsi_precompute(nbars):
+    return _indicator_case(bt.ind.RSI, nbars, True, period=14)
+
+
+def case_rsi_streaming(nbars):
+    return _indicator_case(bt.ind.RSI, nbars, False, period=14)
+
+
+def case_order_create(nbars):
+    data = bt.feeds.PandasData(dataname=synthetic_frame(10))
+    orders = [None] * nbars  # keep them alive, like a trade history would
+
+    def run():
+        for i in range(nbars):
+            if i % 2:
+                orders[i] = Order(data, side=Order.SELL, size=-10.0, price=100.0)
+            else:
+                orders[i] = Order(data, side=Order.BUY, target_pct=1.0, price=100.0)
+        return nbars
+
+    return run
+
+
+class _OrderSink:
+    def notify_order(self, order):
+        pass
+
+
+def case_broker_execute_pending(nbars, nfeeds=8):
+    datas = [bt.feeds.PandasData(dataname=df) for df in synthetic_feeds(nbars, nfeeds).values()]
+
+    def run():
+        broker = Broker(100_000.0)
+        sink = _OrderSink()
+
+        # one sell + one buy per bar, rotating through the feeds
+        for i in range(nbars):
+            for d in datas:
+                d.idx = i
+            held, target = datas[i % nfeeds], datas[(i + 1) % nfeeds]
+            pos = broker.getposition(held)
+            if pos.size:
+                broker.submit(Order(held, side=Order.SELL, size=-pos.size, price=held.close[0], strategy=sink))
+            broker.submit(Order(target, side=Order.BUY, target_pct=1.0, price=target.close[0], strategy=sink))
+            broker.execute_pending()
+        return nbars
+
+    return run
+
+
+def case_cerebro_run(nbars, nfeeds=8, indicators=1):
+    cerebro = build_cerebro(synthetic_feeds(nbars, nfeeds), indicators=indicators)
+
+    def run():
+        cerebro.run()
+        return nbars
+
+    return run
+
+
+def case_holdings_log(nbars, nfeeds=8):
+    tmp = tempfile.TemporaryDirectory()
+    hlog = InvertedHoldingsLog(str(Path(tmp.name) / "report.html"))
+    hlog.clear()
+    cerebro = build_cerebro(synthetic_feeds(nbars, nfeeds), hlog=hlog)
+
+    def run():
+        with tmp:
+            cerebro.run()
+
+            t0 = time.perf_counter()
+            hlog.write()
+            write_sec = time.perf_counter() - t0
+        return nbars, {"write_sec": write_sec}
+
+    return run
+
+
+# =========================
+# Runner
+# =========================
+def measure(name, case, **kwargs):
+    # strategies and the broker may print; keep the report readable
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    # timing pass: setup excluded, no tracing overhead
+    gc.collect()
+    with quiet:
+        run = case(**kwargs)
+        t0 = time.perf_counter()
+        out = run()
+        elapsed = time.perf_counter() - t0
+    del run
+
+    # memory pass: peak over setup + run (tracemalloc also sees numpy buffers)
+    gc.collect()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        case(**kwargs)()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    bars, extra = out if isinstance(out, tuple) else (out, {})
+    result = dict(
+        case=name,
+        params=kwargs,
+        bars=bars,
+        seconds=elapsed,
+        bars_per_sec=bars / elapsed if elapsed > 0 else float("inf"),
+        peak_mem_mb=peak / 2 ** 20,
+        **extra,
+    )
+    print(
+        f"{name:<24} {json.dumps(kwargs):<40} "
+        f"{result['bars_per_sec']:>14,.0f} bars/s {result['peak_mem_mb']:>9.1f} MB"
+    )
+    return result
+
+
+def plan(preset):
+    cfg = PRESETS[preset]
+    cases = []
+
+    for n in cfg["bars"]:
+        cases += [
+            ("line_getitem", case_line_getitem, dict(nbars=n)),
+            ("sma_precompute", case_sma_precompute, dict(nbars=n)),
+            ("rsi_precompute", case_rsi_precompute, dict(nbars=n)),
+            ("order_create", case_order_create, dict(nbars=n)),
+            ("broker_execute_pending", case_broker_execute_pending, dict(nbars=n)),
+            ("cerebro_run", case_cerebro_run, dict(nbars=n)),
+            ("holdings_log", case_holdings_log, dict(nbars=n)),
+        ]
+        # per-bar Python paths: cap their size so the full preset finishes
+        if n <= 100_000:
+            cases += [
+                ("sma_streaming", case_sma_streaming, dict(nbars=n)),
+                ("rsi_streaming", case_rsi_streaming, dict(nbars=n)),
+            ]
+
+    for f in cfg["feeds"]:
+        cases.append(("cerebro_run", case_cerebro_run, dict(nbars=cfg["feed_scaling_bars"], nfeeds=f)))
+
+    for k in cfg["indicators"]:
+        cases.append(("cerebro_run", case_cerebro_run, dict(nbars=cfg["indicator_scaling_bars"], indicators=k)))
+
+    return cases
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline):
+    def key(r):
+        return r["case"], json.dumps(r["params"], sort_keys=True)
+
+    before = {key(r): r for r in baseline["results"]}
+    print(f"\n{'case':<24} {'params':<40} {'speedup':>8} {'mem ratio':>10}")
+    for r in results:
+        b = before.get(key(r))
+        if b is None:
+            continue
+        speedup = r["bars_per_sec"] / b["bars_per_sec"]
+        mem = r["peak_mem_mb"] / b["peak_mem_mb"] if b["peak_mem_mb"] else float("nan")
+        print(f"{r['case']:<24} {json.dumps(r['params']):<40} {speedup:>7.2f}x {mem:>9.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--case", action="append", help="only run cases with this name (repeatable)")
+    parser.add_argument("-o", "--output", default="benchmarks/results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, fn, kwargs in plan(args.preset):
+        if args.case and name not in args.case:
+            continue
+        results.append(measure(name, fn, **kwargs))
+
+    report = dict(
+        preset=args.preset,
+        commit=_git_commit(),
+        python=sys.version.split()[0],
+        numpy=np.__version__,
+        pandas=pd.__version__,
+        machine=platform.machine(),
+        results=results,
+    )
+
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nwrote {out}")
+
+    if args.baseline:
+        compare(results, json.loads(Path(args.baseline).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize to what PandasData expects: lower-case columns, naive 'datetime' index."""
+    df = df.copy()
+
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df.columns = df.columns.str.lower()
+
+    df.index = pd.DatetimeIndex(df.index)
+    if df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    df.index.name = "datetime"
+
+    return df.sort_index()
+
+
+class DataSource:
+    """
+    Where OHLCV bars come from.
+
+    fetch(ticker, start, end) returns the bars in [start, end] (both
+    inclusive dates) as a normalized frame, an empty frame if the range has
+    no bars, and raises on failure.
+    """
+
+    def fetch(self, ticker: str, start, end) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class YFinanceSource(DataSource):
+    def __init__(self, auto_adjust: bool = True):
+        import yfinance
+
+        self._yf = yfinance
+        self.auto_adjust = auto_adjust
+
+    def fetch(self, ticker, start, end):
+        # Ticker.history keeps no module-level state, unlike yf.download,
+        # so it is safe to call from several threads at once
+        kwargs = dict(start=pd.Timestamp(start), auto_adjust=self.auto_adjust, actions=False)
+        if end is not None:
+            kwargs["end"] = pd.Timestamp(end) + pd.Timedelta(days=1)
+
+        df = self._yf.Ticker(ticker).history(**kwargs)
+        return normalize_frame(df)
+
+
+class LocalDirectorySource(DataSource):
+    """Reads <directory>/<TICKER>.parquet or <directory>/<TICKER>.csv."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def fetch(self, ticker, start, end):
+        parquet = self.directory / f"{ticker}.parquet"
+        csv = self.directory / f"{ticker}.csv"
+
+        if parquet.exists():
+            df = pd.read_parquet(parquet)
+        elif csv.exists():
+            df = pd.read_csv(csv, index_col=0, parse_dates=True)
+        else:
+            raise FileNotFoundError(f"no {ticker}.parquet or {ticker}.csv in {self.directory}")
+
+        df = normalize_frame(df)
+
+        lo = pd.Timestamp(start)
+        hi = pd.Timestamp.max if end is None else pd.Timestamp(end) + pd.Timedelta(days=1)
+        return df[(df.index >= lo) & (df.index < hi)]
+
+
+def fetch_with_retry(
+        source: DataSource,
+        ticker: str,
+        start,
+        end,
+        max_retries: int = 3,
+        base_delay_sec: float = 1.0,
+        max_delay_sec: float = 30.0,
+        allow_empty: bool = False,
+) -> pd.DataFrame | None:
+    """
+    One ticker with exponential backoff and full jitter between attempts.
+    Returns None once all retries failed.
+    """
+    last_err = None
+
+    for attempt in range(1, max_retries + 1):
+        try:
+            df = source.fetch(ticker, start, end)
+
+            if df.empty and not allow_empty:
+                raise ValueError("Empty dataframe returned")
+
+            return df  # success
+
+        except Exception as e:
+            last_err = e
+            print(f"[{ticker}] attempt {attempt}/{max_retries} failed: {e}")
+
+            if attempt < max_retries:
+                cap = min(max_delay_sec, base_delay_sec * 2 ** (attempt - 1))
+                time.sleep(random.uniform(0, cap))
+
+    # only reached if all retries failed
+    print(f"[{ticker}] FAILED after {max_retries} retries: {last_err}")
+    return None
+
+
+def fetch_many(tickers, load, max_workers: int = 8) -> dict[str, pd.DataFrame | None]:
+    """Run ``load(ticker)`` for all tickers on a thread pool; keeps ticker order."""
+    tickers = list(tickers)
+    if not tickers:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+        return dict(zip(tickers, pool.map(load, tickers)))
@@ -1,45 +1,43 @@
-import pandas as pd
-import yfinance as yf
-import time
+from functions.data_sources import YFinanceSource, fetch_many, fetch_with_retry
+from functions.market_data_cache import MarketDataCache
 
 
-def download_with_retry(tickers, start_date, end_date=None, max_retries=3, retry_delay_sec=2):
-    data_frames = {}
-
-    for ticker in tickers:
-        last_err = None
+def download_with_retry(tickers, start_date, end_date=None, max_retries=3, retry_delay_sec=2,
+                        cache_dir=None, offline=False, source=None, max_workers=8):
+    """
+    Fetch normalized OHLCV frames for all tickers, several at a time.
 
-        for attempt in range(1, max_retries + 1):
-            try:
-                if (end_date is not None):
-                    df = yf.download(ticker, start=pd.Timestamp(start_date),
-                                     end=pd.Timestamp(end_date) + pd.Timedelta(days=1), threads=False)
-                else:
-                    df = yf.download(ticker, start=pd.Timestamp(start_date), threads=False)
+    retry_delay_sec: base delay of the per-ticker exponential backoff (with jitter)
+    cache_dir:       keep frames in a local MarketDataCache and only fetch the
+                     bars missing from it (None → always download everything)
+    offline:         never touch the network; serve from cache_dir only
+    source:          DataSource to fetch from (None → YFinanceSource)
+    max_workers:     tickers fetched concurrently
+    """
+    if offline and cache_dir is None:
+        raise ValueError("offline mode needs a cache_dir")
 
-                if df.empty:
-                    raise ValueError("Empty dataframe returned")
+    cache = MarketDataCache(cache_dir) if cache_dir is not None else None
+    if source is None and not offline:
+        source = YFinanceSource()
 
-                df.index.name = "datetime"
+    def fetch(ticker, lo, hi, allow_empty=False):
+        return fetch_with_retry(source, ticker, lo, hi, max_retries, retry_delay_sec, allow_empty=allow_empty)
 
-                # Normalize columns
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = df.columns.get_level_values(0)
+    def load(ticker):
+        if cache is None:
+            return fetch(ticker, start_date, end_date)
 
-                df.columns = df.columns.str.lower()
+        return cache.get(ticker, start_date, end_date, fetch, offline=offline)
 
-                data_frames[ticker] = df
-                break  # success
-
-            except Exception as e:
-                last_err = e
-                print(f"[{ticker}] attempt {attempt}/{max_retries} failed: {e}")
+    data_frames = {}
 
-                if attempt < max_retries:
-                    time.sleep(retry_delay_sec)
+    for ticker, df in fetch_many(tickers, load, max_workers=max_workers).items():
+        if df is None or df.empty:
+            if offline:
+                print(f"[{ticker}] not in cache {cache_dir} (offline)")
+            continue
 
-        else:
-            # only executes if all retries failed
-            print(f"[{ticker}] FAILED after {max_retries} retries: {last_err}")
+        data_frames[ticker] = df
 
     return data_frames
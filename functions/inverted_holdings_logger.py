@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 from datetime import date
 
+import numpy as np
+
+
+def _compact_json(values) -> str:
+    """JSON array without whitespace, safe to embed in a <script> block."""
+    return json.dumps(values, separators=(",", ":")).replace("</", "<\\/")
+
 
 def change_class(val: str) -> str:
     v = val.strip().lower()
@@ -27,38 +35,105 @@ class InvertedHoldingsLog:
       cells   = percent of equity (blank if < min_pct_to_show)
 
     Sticky headers + first column.
+
+    Each day is recorded as raw numbers in a preallocated NumPy structured
+    array (see ``records``); cells are only formatted when the report is
+    written, newest row first. ``to_frame()`` / ``export()`` give the same
+    data for analysis.
     """
     file_path: str
     min_pct_to_show: float = 2.0
 
+    # render formats for the change / value columns (percent numbers)
+    change_format: str = "{:+.2f}%"
+    value_format: str = "{:+,.1f}%"
+
     columns: list[str] = field(default_factory=list)
-    rows: list[tuple[str, list[str], str, str, str]] = field(
-        default_factory=list
-    )  # (date, asset_cells, value_cell, change_cell, notes_cell)
+    notes_labels: list[str] = field(default_factory=list)  # notes code -> text
 
     _has_notes_column: bool = False
     _has_change_column: bool = False
     _has_value_column: bool = False
 
+    _data: Any = None  # structured array, grown by doubling
+    _size: int = 0
+
+    def __getstate__(self):
+        # pickled (e.g. in engine checkpoints) without the unused capacity
+        state = self.__dict__.copy()
+        if self._data is not None:
+            state["_data"] = self._data[:self._size].copy()
+        return state
+
     def clear(self) -> None:
         path = Path(self.file_path)
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text("", encoding="utf-8")
 
         self.columns.clear()
-        self.rows.clear()
+        self.notes_labels.clear()
+        self._notes_codes = {}
+        self._data = None
+        self._size = 0
         self._last_logged_date = None
         self._has_notes_column = False
         self._has_change_column = False
 
+    @property
+    def records(self) -> np.ndarray:
+        """
+        One record per collected day, oldest first:
+        date (datetime64[D]), pct (float64 per column), value, change
+        (float64, NaN when not given) and notes (int32 code into
+        ``notes_labels``, -1 when not given).
+        """
+        if self._data is None:
+            return np.empty(0, dtype=self._dtype())
+        return self._data[:self._size]
+
+    def _dtype(self) -> np.dtype:
+        return np.dtype([
+            ("date", "datetime64[D]"),
+            ("pct", np.float64, (len(self.columns),)),
+            ("value", np.float64),
+            ("change", np.float64),
+            ("notes", np.int32),
+        ])
+
+    def _next_record(self, strategy) -> np.void:
+        if self._data is None:
+            # one row per bar of the master feed is the most a run can log
+            capacity = max(len(strategy.datas[0]), 256)
+            self._data = np.empty(capacity, dtype=self._dtype())
+        elif self._size == len(self._data):
+            grown = np.empty(2 * len(self._data), dtype=self._data.dtype)
+            grown[:self._size] = self._data
+            self._data = grown
+
+        rec = self._data[self._size]
+        self._size += 1
+        return rec
+
+    def _notes_code(self, notes: str) -> int:
+        code = self._notes_codes.get(notes)
+        if code is None:
+            code = self._notes_codes[notes] = len(self.notes_labels)
+            self.notes_labels.append(notes)
+        return code
+
     def collect(
             self,
             strategy,
             assets,
-            change: str | None = None,
-            value: str | None = None,
+            change: float | None = None,
+            value: float | None = None,
             notes: str | None = None,
     ) -> None:
+        """
+        change / value are percent numbers (formatted with change_format /
+        value_format when written); notes is a short label such as the
+        strategy state.
+        """
         dt = strategy.datas[0].datetime.date(0)
         if self._last_logged_date == dt:
             return
@@ -70,23 +145,20 @@ class InvertedHoldingsLog:
 
         if change is not None:
             self._has_change_column = True
-        change_cell = "" if change is None else str(change)
 
         if value is not None:
             self._has_value_column = True
-        value_cell = "" if value is None else str(value)
 
         if notes is not None:
             self._has_notes_column = True
-        notes_cell = "" if notes is None else str(notes)
 
         day_columns: list[str] = []
-        day_pct: dict[str, float] = {}
+        day_pct: list[float] = []
 
         for item in assets:
             name, pct = self._holdings_pct(strategy, item, equity)
             day_columns.append(name)
-            day_pct[name] = pct
+            day_pct.append(pct)
 
         if not self.columns:
             self.columns = day_columns
@@ -98,24 +170,42 @@ class InvertedHoldingsLog:
                 f"Expected={self.columns}, Got={day_columns}"
             )
 
-        row_cells: list[str] = []
-        for c in self.columns:
-            pct = float(day_pct.get(c, 0.0))
-            if abs(pct) < float(self.min_pct_to_show):
-                row_cells.append("")
-            else:
-                row_cells.append(f"{pct:.1f}%")
-
-        self.rows.insert(
-            0,
-            (
-                dt.isoformat(),
-                row_cells,
-                value_cell,
-                change_cell,
-                notes_cell,
-            ),
+        rec = self._next_record(strategy)
+        rec["date"] = dt
+        rec["pct"] = day_pct
+        rec["value"] = np.nan if value is None else value
+        rec["change"] = np.nan if change is None else change
+        rec["notes"] = -1 if notes is None else self._notes_code(str(notes))
+
+    def to_frame(self):
+        """The collected days as a DataFrame indexed by date (notes as text)."""
+        import pandas as pd
+
+        records = self.records
+        df = pd.DataFrame(
+            records["pct"].reshape(len(records), len(self.columns)),
+            index=pd.DatetimeIndex(records["date"], name="date"),
+            columns=self.columns,
         )
+        df["value"] = records["value"]
+        df["change"] = records["change"]
+
+        labels = np.array(self.notes_labels + [None], dtype=object)
+        df["notes"] = labels[records["notes"]]  # -1 picks the trailing None
+        return df
+
+    def export(self, path: str | Path) -> None:
+        """Write the collected days to a .parquet or .csv file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        df = self.to_frame()
+        if path.suffix == ".parquet":
+            df.to_parquet(path)
+        elif path.suffix == ".csv":
+            df.to_csv(path)
+        else:
+            raise ValueError(f"unsupported export format {path.suffix!r} (use .parquet or .csv)")
 
     def _get_css(self) -> str:
             """Return CSS styling for both chart and table."""
@@ -166,19 +256,8 @@ class InvertedHoldingsLog:
                 + (["Notes"] if self._has_notes_column else [])
             )
 
-    def _parse_percentage(self, pct_str: str) -> float:
-        """Parse percentage string like '+8,062.2%' to float 8062.2"""
-        if not pct_str or pct_str.strip() == "":
-            return 0.0
-        cleaned = pct_str.replace("%", "").replace("+", "").replace(",", "").strip()
-        try:
-            return float(cleaned)
-        except ValueError:
-            return 0.0
-
-    def _format_date(self, iso_yyyy_mm_dd: str) -> str:
-        """Format ISO date to display format."""
-        d = date.fromisoformat(iso_yyyy_mm_dd)
+    def _format_date(self, d: date) -> str:
+        """Format a date to display format."""
         return f"{d:%b} {d.day}, {d:%Y}"
 
     def _escape_html(self, s: str) -> str:
@@ -193,19 +272,17 @@ class InvertedHoldingsLog:
 
     def generate_chart_data(self) -> tuple[list[str], list[float]]:
             """Extract chart data from rows and return labels and values."""
-            chart_data = []
-            for date_str, cells, value_cell, change_cell, notes_cell in reversed(self.rows):
-                chart_data.append({
-                    'date': self._format_date(date_str),
-                    'change': self._parse_percentage(value_cell)  # Use value_cell for cumulative values
-                })
-
-            chart_labels = [item['date'] for item in chart_data]
-            chart_values = [item['change'] for item in chart_data]
+            records = self.records
+            chart_labels = [self._format_date(d) for d in records["date"].tolist()]
+
+            # cumulative values, at the precision the table shows them
+            chart_values = np.nan_to_num(records["value"]).round(1).tolist()
             return chart_labels, chart_values
 
     def generate_chart_html(self, chart_labels: list[str], chart_values: list[float]) -> str:
             """Generate HTML for Chart.js line chart."""
+            chart_labels = _compact_json(chart_labels)
+            chart_values = _compact_json(chart_values)
             return f'''
             <div class="chart-container">
                 <canvas id="portfolioChart"></canvas>
@@ -315,8 +392,8 @@ class InvertedHoldingsLog:
         </script>
             '''
 
-    def generate_table_html(self) -> str:
-            """Generate HTML table with all holdings data."""
+    def iter_table_html(self):
+            """Yield the HTML table piece by piece, newest row first."""
             cols = self._get_column_headers()
             html_parts = ['<div class="table-container"><table><thead><tr>']
 
@@ -326,15 +403,21 @@ class InvertedHoldingsLog:
                 html_parts.append(f"<th{cls}>{self._escape_html(c)}</th>")
 
             html_parts.append("</tr></thead><tbody>")
+            yield ''.join(html_parts)
 
             # Data rows
-            for date_str, cells, value_cell, change_cell, notes_cell in self.rows:
-                html_parts.append("<tr>")
-                html_parts.append(f"<td>{self._escape_html(self._format_date(date_str))}</td>")
+            for d, pcts, value, change, notes in self._iter_rows_newest_first():
+                html_parts = ["<tr>"]
+                html_parts.append(f"<td>{self._escape_html(self._format_date(d))}</td>")
 
-                for cell in cells:
+                for pct in pcts:
+                    cell = "" if abs(pct) < float(self.min_pct_to_show) else f"{pct:.1f}%"
                     html_parts.append(f"<td>{self._escape_html(cell)}</td>")
 
+                change_cell = "" if change != change else self.change_format.format(change)
+                value_cell = "" if value != value else self.value_format.format(value)
+                notes_cell = "" if notes < 0 else self.notes_labels[notes]
+
                 if self._has_change_column:
                     cls = change_class(change_cell)
                     html_parts.append(f"<td class='{cls}'>{self._escape_html(change_cell)}</td>")
@@ -346,32 +429,45 @@ class InvertedHoldingsLog:
                     html_parts.append(f"<td class='notes'>{self._escape_html(notes_cell)}</td>")
 
                 html_parts.append("</tr>")
+                yield ''.join(html_parts)
+
+            yield "</tbody></table></div>"
+
+    def _iter_rows_newest_first(self, chunk: int = 4096):
+            """(date, pcts, value, change, notes code) per row, converted a chunk at a time."""
+            records = self.records
+            for stop in range(len(records), 0, -chunk):
+                part = records[max(stop - chunk, 0):stop][::-1]
+                yield from zip(
+                    part["date"].tolist(),
+                    part["pct"].tolist(),
+                    part["value"].tolist(),
+                    part["change"].tolist(),
+                    part["notes"].tolist(),
+                )
 
-            html_parts.append("</tbody></table></div>")
-            return ''.join(html_parts)
+    def generate_table_html(self) -> str:
+            """Generate HTML table with all holdings data."""
+            return ''.join(self.iter_table_html())
 
     def write(self) -> None:
-        """Generate HTML with both chart and table sections."""
+        """Stream HTML with both chart and table sections to the file."""
         path = Path(self.file_path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
         # Generate chart data and HTML
         chart_labels, chart_values = self.generate_chart_data()
         chart_html = self.generate_chart_html(chart_labels, chart_values)
-        table_html = self.generate_table_html()
-
-        # Build final HTML
-        html = [
-            "<!doctype html><html><head><meta charset='utf-8'>",
-            "<meta name='viewport' content='width=device-width, initial-scale=1'>",
-            f"<style>{self._get_css()}</style>",
-            "</head><body>",
-            chart_html,
-            table_html,
-            "</body></html>"
-        ]
-
-        path.write_text("".join(html), encoding="utf-8")
+        del chart_labels, chart_values
+
+        with path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write("<!doctype html><html><head><meta charset='utf-8'>")
+            f.write("<meta name='viewport' content='width=device-width, initial-scale=1'>")
+            f.write(f"<style>{self._get_css()}</style>")
+            f.write("</head><body>")
+            f.write(chart_html)
+            f.writelines(self.iter_table_html())
+            f.write("</body></html>")
 
     @staticmethod
     def _holdings_pct(strategy, item, equity: float) -> tuple[str, float]:
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mytrader.feeds.mmapdata import COLUMNS, MmapData, load_columns, save_columns
+
+
+class MarketDataCache:
+    """
+    Persistent per-ticker OHLCV cache in a memory-mappable columnar layout:
+
+      <cache_dir>/<TICKER>/datetime.npy   int64 ns timestamps
+      <cache_dir>/<TICKER>/<column>.npy   float64, one file per column
+      <cache_dir>/<TICKER>/meta.json      {"start": ..., "end": ...}
+
+    ``start`` / ``end`` are the requested date range the cache has been
+    filled for (not the first/last bar), so a range with no trading days
+    is not fetched again. meta.json is written last and marks a complete entry.
+
+    The same directories open as zero-copy feeds through ``feed()``
+    (mytrader.feeds.MmapData).
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+
+    def _dir(self, ticker: str) -> Path:
+        return self.cache_dir / ticker.upper()
+
+    def coverage(self, ticker: str) -> tuple[date, date] | None:
+        meta = self._dir(ticker) / "meta.json"
+        if not meta.exists():
+            return None
+        m = json.loads(meta.read_text(encoding="utf-8"))
+        return date.fromisoformat(m["start"]), date.fromisoformat(m["end"])
+
+    def load(self, ticker: str) -> pd.DataFrame | None:
+        if self.coverage(ticker) is None:
+            return None
+
+        stamps, columns = load_columns(self._dir(ticker), mmap_mode=None)
+        index = pd.DatetimeIndex(stamps.view("M8[ns]"), name="datetime")
+
+        return pd.DataFrame(columns, index=index)
+
+    def feed(self, ticker: str, start=None, end=None) -> MmapData | None:
+        """Memory-mapped feed over the cached bars in [start, end]."""
+        if self.coverage(ticker) is None:
+            return None
+        return MmapData(self._dir(ticker), start=start, end=end)
+
+    def save(self, ticker: str, df: pd.DataFrame, start: date, end: date) -> None:
+        path = self._dir(ticker)
+        tmp = path.with_name(path.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        save_columns(df, tmp)
+
+        (tmp / "meta.json").write_text(
+            json.dumps({"start": start.isoformat(), "end": end.isoformat()}),
+            encoding="utf-8",
+        )
+
+        shutil.rmtree(path, ignore_errors=True)
+        tmp.rename(path)
+
+    def get(self, ticker, start, end, fetch, offline=False) -> pd.DataFrame | None:
+        """
+        Frame for [start, end] (end=None → today), fetching only the
+        missing head/tail ranges through ``fetch(ticker, start, end,
+        allow_empty)``. ``fetch`` returns None on failure; only the first
+        fetch of a ticker must return bars. A failed head or tail range is
+        left uncovered and fetched again next time. Offline mode never
+        fetches and returns whatever is cached.
+        """
+        today = date.today()
+        start = pd.Timestamp(start).date()
+        end = today if end is None else min(pd.Timestamp(end).date(), today)
+
+        # today's bar may still be forming: never mark it as cached
+        done = min(end, today - timedelta(days=1))
+
+        cached = self.load(ticker)
+        cov = self.coverage(ticker)
+
+        if not offline and cov is None:
+            # a first fetch without bars is a failure, not an empty range
+            df = fetch(ticker, start, end, allow_empty=False)
+            if df is not None:
+                cached = _merge([df])
+                self.save(ticker, cached, start, _covered_until(cached, done))
+
+        elif not offline:
+            lo, hi = cov
+            parts = [cached]
+
+            # head: with the entry's bars cached, an empty head is the time
+            # before the ticker was listed, so it is covered from then on
+            if start < lo:
+                head = (start, lo - timedelta(days=1))
+                if not _has_weekdays(*head):
+                    lo = start
+                else:
+                    df = fetch(ticker, *head, allow_empty=True)
+                    if df is not None:
+                        parts.append(df)
+                        lo = start
+
+            # tail (incremental top-up), whether or not the head worked: an
+            # empty or short top-up only covers up to the last bar received
+            if end > hi:
+                tail = (hi + timedelta(days=1), end)
+                if not _has_weekdays(*tail):
+                    hi = max(hi, done)
+                else:
+                    df = fetch(ticker, *tail, allow_empty=True)
+                    if df is not None:
+                        parts.append(df)
+                        hi = max(hi, _covered_until(_merge(parts), done))
+
+            if len(parts) > 1 or (lo, hi) != cov:
+                cached = _merge(parts)
+                self.save(ticker, cached, lo, hi)
+
+        if cached is None:
+            return None
+
+        idx = cached.index
+        lo = pd.Timestamp(start)
+        hi = pd.Timestamp(end) + pd.Timedelta(days=1)
+        return cached[(idx >= lo) & (idx < hi)]
+
+
+def _has_weekdays(lo: date, hi: date) -> bool:
+    return np.busday_count(lo, hi + timedelta(days=1)) > 0
+
+
+def _covered_until(df: pd.DataFrame, done: date) -> date:
+    """
+    Last day the cache can be marked filled for: ``done``, unless bars are
+    missing before it. An empty or short response may be a transient
+    failure (``Ticker.history`` returns an empty frame instead of raising),
+    so coverage stops at the last bar received and the rest is fetched
+    again next time; only a gap of weekend days is taken as complete.
+    """
+    if df.empty:
+        return done
+    last = df.index[-1].date()
+    if last >= done or not _has_weekdays(last + timedelta(days=1), done):
+        return done
+    return last
+
+
+def _merge(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    parts = [p.reindex(columns=list(COLUMNS)) for p in parts]
+    df = pd.concat(parts)
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    df.index.name = "datetime"
+    return df
@@ -1,3 +1,6 @@
+from mytrader.tradelog import DEBUG
+
+
 def log_monthly_deployed(
         strategy,
 ):
@@ -10,6 +13,11 @@ def log_monthly_deployed(
         The calling strategy instance (self)
     """
 
+    # this is all log output: skip the formatting when DEBUG is off
+    if not strategy.log_enabled(DEBUG):
+        strategy.prev_portfolio_value = strategy.broker.getvalue()
+        return
+
     def current_positions(strat):
         # Strategy-agnostic: look at all data feeds and return those with a non-zero position
         positions = []
@@ -64,11 +72,11 @@ def log_monthly_deployed(
                 data.close[0],
             )
 
-            strategy.log(f"---- {data._name}: {percent:.1f}% | O:{o:,.2f} H:{h:,.2f} L:{l:,.2f} C:{c:,.2f}")
+            strategy.debug(f"---- {data._name}: {percent:.1f}% | O:{o:,.2f} H:{h:,.2f} L:{l:,.2f} C:{c:,.2f}")
 
     # --- logging output (UNCHANGED FORMAT)
     if positions_log:
-        strategy.log(
+        strategy.debug(
             f'---- {", ".join(positions_log)} '
             f'(Deployed: ${deployed:,.2f}) (Cash: ${cash:,.2f}) '
             f'(Total: ${portfolio_value:,.2f}) '
@@ -76,7 +84,7 @@ def log_monthly_deployed(
             f'(Total Growth: {total_growth_pct:+.2f}%)'
         )
     else:
-        strategy.log(
+        strategy.debug(
             f'---- None (Deployed: $0.00) (Cash: ${cash:,.2f}) '
             f'(Total: ${portfolio_value:,.2f}) '
             f'(Change: {growth_pct:+.2f}%) '
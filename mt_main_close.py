@@ -1,3 +1,5 @@
+import os
+import tempfile
 from datetime import date
 import mytrader as bt
 
@@ -9,6 +11,18 @@ START_DATE = '2011-01-01'
 END_DATE = '2025-12-31'
 TRADE_DATE = '2012-01-01'
 
+# Local market data cache (None → always download); OFFLINE never hits the network
+CACHE_DIR = 'data_cache'
+OFFLINE = False
+
+# Strategy log verbosity: SILENT, INFO (trades/state changes) or DEBUG (every bar); LOG_FILE None → stdout
+LOG_LEVEL = bt.tradelog.DEBUG
+LOG_FILE = None
+
+# Warm start: resume from the previous run's checkpoint and process only the new bars (None → full replay)
+CHECKPOINT = None  # e.g. 'data_cache/mt_main_close.ckpt'
+VERIFY_CHECKPOINT = False  # after a resume, also replay everything and compare the engine states
+
 
 STRATEGIES_TO_RUN = ['MT_TQQQFTLT_COC']
 
@@ -21,45 +35,67 @@ STRATEGY_CLASSES = {
 # -----------------------
 TICKERS = ['SPY', 'TQQQ', 'SPXL', 'UVXY', 'TECL', 'SQQQ', 'BSV', 'SOXL']
 
-DATA_FRAMES = download_with_retry(TICKERS, START_DATE, END_DATE)
+DATA_FRAMES = download_with_retry(TICKERS, START_DATE, END_DATE, cache_dir=CACHE_DIR, offline=OFFLINE)
 
 
-# Setup common for both strategies
-def setup_cerebro():
-    cerebro = bt.Cerebro()
+# One cerebro for all strategies: one pass over the data, shared indicators,
+# a separate broker per strategy
+def setup_cerebro(with_data=True):
+    cerebro = bt.Cerebro(loglevel=LOG_LEVEL, logfile=LOG_FILE)
 
     cerebro.broker.setcash(STARTING_CASH)
 
     cerebro.addanalyzer(bt.analyzers.DrawDown, _name='dd')
     cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
 
-    # Add data feeds
-    for ticker, df in DATA_FRAMES.items():
-        data = bt.feeds.PandasData(dataname=df)
-        cerebro.adddata(data, name=ticker)
+    # Add data feeds (a resumed run gets them from the checkpoint)
+    if with_data:
+        for ticker, df in DATA_FRAMES.items():
+            data = bt.feeds.PandasData(dataname=df)
+            cerebro.adddata(data, name=ticker)
+
+    for strategy_name in STRATEGIES_TO_RUN:
+        cerebro.addstrategy(
+            STRATEGY_CLASSES[strategy_name],
+            trade_start=date.fromisoformat(TRADE_DATE)
+        )
 
     return cerebro
 
 
-# Run strategies dynamically
+# Run all strategies in a single pass
 results = {}
 
-for strategy_name in STRATEGIES_TO_RUN:
-    print(f"\nRunning {strategy_name}...")
-    cerebro = setup_cerebro()
-    strategy_class = STRATEGY_CLASSES[strategy_name]
-    cerebro.addstrategy(
-        strategy_class,
-        trade_start=date.fromisoformat(TRADE_DATE)
-    )
-    result = cerebro.run()
+resumed = CHECKPOINT is not None and os.path.exists(CHECKPOINT)
 
-    final_value = cerebro.broker.getvalue()
-    min_portfolio_value = result[0].min_portfolio_value
-    dd = result[0].analyzers.getbyname('dd').get_analysis()
+print(f"\nRunning {', '.join(STRATEGIES_TO_RUN)}{' (resumed)' if resumed else ''}...")
+if resumed:
+    cerebro = setup_cerebro(with_data=False)
+    cerebro.resume(CHECKPOINT)
+    for dt, bars in bt.feeds.frame_bars(DATA_FRAMES, after=cerebro.datas[0].index[-1]):
+        cerebro.push(dt, bars)
+    strategies = cerebro.stop()
+else:
+    cerebro = setup_cerebro()
+    strategies = cerebro.run()
+
+if CHECKPOINT is not None:
+    cerebro.checkpoint(CHECKPOINT)
+
+    if resumed and VERIFY_CHECKPOINT:
+        replay = setup_cerebro()
+        replay.run()
+        with tempfile.TemporaryDirectory() as tmp:
+            replay.checkpoint(os.path.join(tmp, 'replay.ckpt'))
+            diffs = bt.checkpoint.compare(CHECKPOINT, os.path.join(tmp, 'replay.ckpt'))
+        print("Checkpoint verified against a full replay" if not diffs else "Checkpoint MISMATCH:\n" + "\n".join(diffs))
+
+for strategy_name, strat in zip(STRATEGIES_TO_RUN, strategies):
+    final_value = strat.broker.getvalue()
+    min_portfolio_value = strat.min_portfolio_value
+    dd = strat.analyzers.getbyname('dd').get_analysis()
     max_dd_pct = dd.max.drawdown
-    returns = result[0].analyzers.getbyname('returns').get_analysis()
-    strat = result[0]
+    returns = strat.analyzers.getbyname('returns').get_analysis()
 
     # Manually compute CAR using trading bars (start date != trade date)
     start_dt = date.fromisoformat(TRADE_DATE)
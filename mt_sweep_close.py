@@ -0,0 +1,56 @@
+from datetime import date
+import mytrader as bt
+
+from functions.download_with_retry import download_with_retry
+from mytrader.strategies.mt_tqqq_ftlt_coc import MT_TQQQFTLT_COC
+
+STARTING_CASH = 10000
+START_DATE = '2011-01-01'
+END_DATE = '2025-12-31'
+TRADE_DATE = '2012-01-01'
+
+# Local market data cache (None → always download); OFFLINE never hits the network
+CACHE_DIR = 'data_cache'
+OFFLINE = False
+
+TICKERS = ['SPY', 'TQQQ', 'SPXL', 'UVXY', 'TECL', 'SQQQ', 'BSV', 'SOXL']
+
+# -----------------------
+# Parameter grid (every combination is one backtest)
+# -----------------------
+GRID = dict(
+    rsi_period=[8, 10, 12],
+    ma200_period=[150, 200],
+    ma20_period=[20],
+    rsi_tqqq_overbought=[79, 82],
+    rsi_uvxy_extreme=[80, 84],
+)
+
+MAX_CPUS = None  # None → one worker per CPU
+FAST = True  # vectorized engine (mytrader.fastpath); False → full bar loop per combination
+
+
+# Process pools re-import this module in every worker (spawn), so keep the
+# work under the __main__ guard.
+if __name__ == "__main__":
+    data_frames = download_with_retry(TICKERS, START_DATE, END_DATE, cache_dir=CACHE_DIR, offline=OFFLINE)
+
+    cerebro = bt.Cerebro()
+    cerebro.broker.setcash(STARTING_CASH)
+
+    for ticker, df in data_frames.items():
+        cerebro.adddata(bt.feeds.PandasData(dataname=df), name=ticker)
+
+    cerebro.optstrategy(
+        MT_TQQQFTLT_COC,
+        trade_start=date.fromisoformat(TRADE_DATE),
+        report=None,  # one HTML report per combination is not useful
+        **GRID,
+    )
+
+    print(f"Running {len(bt.optimizer.param_grid(**GRID))} combinations...")
+    table = cerebro.run(maxcpus=MAX_CPUS, fast=FAST)
+
+    table = table.drop(columns=["trade_start", "report"])
+    table = table.sort_values("car_pct", ascending=False)
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
@@ -1,4 +1,4 @@
 from .cerebro import Cerebro
-from .strategy import Strategy
+from .strategy import Strategy, perbar
 from .utils import num2date
-from . import feeds, ind, analyzers
+from . import feeds, ind, analyzers, checkpoint, fastpath, optimizer, tradelog
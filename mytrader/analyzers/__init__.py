@@ -1,2 +1,7 @@
+from .analyzer import Analyzer
+from .car import CAR
 from .drawdown import DrawDown
 from .returns import Returns
+from .rolling import RollingReturns
+from .sharpe import SharpeRatio
+from .sortino import SortinoRatio
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class Analyzer:
+    """
+    Base analyzer.
+
+    Per-bar analyzers implement next(), called by Cerebro after every
+    strategy.next(). Analyzers with ``vectorized = True`` are never called
+    per bar: Cerebro records the strategy's equity once per bar into
+    ``strategy.equity`` and they compute everything from that array in
+    stop().
+
+    When Cerebro streams bars (push / runstream), vectorized analyzers are
+    brought up to date by one stop() and then updated per bar by next(),
+    which must be O(1): stop() leaves the running state next() continues.
+    """
+
+    vectorized = False
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        # broker value before the first bar (the base of every return)
+        self.start_value = strategy.broker.getvalue()
+
+    @property
+    def equity(self):
+        """Broker value at the close of every bar run so far."""
+        return self.strategy.equity[:self.strategy._equity_len]
+
+    @property
+    def value(self):
+        """Broker value at the close of the current bar."""
+        return float(self.strategy.equity[self.strategy._equity_len - 1])
+
+    @property
+    def dates(self):
+        return self.strategy.data.index[:self.strategy._equity_len]
+
+    def returns(self):
+        """Bar-to-bar returns, the first one measured from start_value."""
+        equity = self.equity
+        prev = np.concatenate(([self.start_value], equity[:-1]))
+        return equity / prev - 1.0
+
+    def next(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def get_analysis(self):
+        return self
+
+    def getstate(self):
+        """Everything but the strategy link (Cerebro checkpoints)."""
+        return {k: v for k, v in vars(self).items() if k != "strategy"}
+
+    def setstate(self, state):
+        self.__dict__.update(state)
+
+
+def drawdowns(equity, start_value):
+    """
+    Running peak (starting at ``start_value``), drawdown in percent and the
+    number of bars since the last new high, for every bar of ``equity``.
+    """
+    peak = np.maximum.accumulate(np.concatenate(([start_value], equity)))
+    new_high = equity > peak[:-1]
+    peak = peak[1:]
+
+    dd = (peak - equity) / peak * 100.0
+
+    # bars since the last strict new high (the start counts as one)
+    bars = np.arange(1, len(equity) + 1)
+    last_high = np.maximum.accumulate(np.where(new_high, bars, 0))
+    length = bars - last_high
+
+    return peak, dd, length
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from .analyzer import Analyzer
+
+
+class CAR(Analyzer):
+    """
+    Compound annual return in percent, from ``start`` (a date, e.g. the
+    strategy's trade_start; default the first bar) to the last bar.
+    """
+
+    vectorized = True
+
+    def __init__(self, strategy, start=None):
+        super().__init__(strategy)
+        self.start = None if start is None else pd.Timestamp(start)
+        self.car = None
+
+    def _update(self, value, last):
+        if self.start_value <= 0:
+            return
+        years = (last - self.start).days / 365.25
+        if years > 0:
+            self.car = float(((value / self.start_value) ** (1 / years) - 1) * 100)
+
+    def next(self):
+        now = pd.Timestamp(self.strategy.datetime.datetime(0))
+        if self.start is None:
+            self.start = now
+        self._update(self.value, now)
+
+    def stop(self):
+        equity = self.equity
+        if not len(equity):
+            return
+
+        dates = self.dates
+        if self.start is None:
+            self.start = pd.Timestamp(dates[0])
+        self._update(equity[-1], dates[-1])
+
+    def get_analysis(self):
+        return {"car": self.car}
@@ -1,28 +1,58 @@
-class DrawDown:
+import numpy as np
+
+from .analyzer import Analyzer, drawdowns
+
+
+class DD:
+    __slots__ = ("drawdown", "moneydown", "len", "duration")
+
+    def __init__(self):
+        self.drawdown = 0.0
+        self.moneydown = 0.0
+        self.len = 0  # bars in drawdown when the max was reached
+        self.duration = 0  # longest stretch below a peak, in bars
+
+
+class DrawDown(Analyzer):
+    vectorized = True
+
     def __init__(self, strategy):
-        self.strategy = strategy
-        self.max = type("DD", (), {})()
-        self.max.drawdown = 0.0
-        self.max.moneydown = 0.0
-        self.max.len = 0
-        self._peak = strategy.broker.getvalue()
-        self._len = 0
+        super().__init__(strategy)
+        self.max = DD()
+
+        # running state (streaming): peak so far, bars since it
+        self.peak = self.start_value
+        self.len = 0
 
     def next(self):
-        v = self.strategy.broker.getvalue()
-        if v > self._peak:
-            self._peak = v
-            self._len = 0
-            return
-        dd = (self._peak - v) / self._peak * 100.0
-        self._len += 1
+        value = self.value
+        if value > self.peak:
+            self.peak = value
+            self.len = 0
+        else:
+            self.len += 1
+
+        dd = (self.peak - value) / self.peak * 100.0
         if dd > self.max.drawdown:
             self.max.drawdown = dd
-            self.max.moneydown = self._peak - v
-            self.max.len = self._len
+            self.max.moneydown = self.peak - value
+            self.max.len = self.len
+        if dd > 0.0:
+            self.max.duration = max(self.max.duration, self.len)
 
     def stop(self):
-        pass
+        equity = self.equity
+        if not len(equity):
+            return
+
+        peak, dd, length = drawdowns(equity, self.start_value)
+        self.peak = float(peak[-1])
+        self.len = int(length[-1])
+
+        k = int(np.argmax(dd))  # first bar of the deepest drawdown
+        if dd[k] > 0.0:
+            self.max.drawdown = float(dd[k])
+            self.max.moneydown = float(peak[k] - equity[k])
+            self.max.len = int(length[k])
 
-    def get_analysis(self):
-        return self
+        self.max.duration = int(length[dd > 0.0].max()) if (dd > 0.0).any() else 0
@@ -1,14 +1,24 @@
-class Returns:
+from .analyzer import Analyzer
+
+
+class Returns(Analyzer):
+    vectorized = True
+
     def __init__(self, strategy):
-        self.strategy = strategy
-        self.start = strategy.broker.getvalue()
+        super().__init__(strategy)
+        self.start = self.start_value
         self.end = self.start
         self.rtot = 0.0
 
     def next(self):
-        self.end = self.strategy.broker.getvalue()
+        self.end = self.value
+        if self.start != 0:
+            self.rtot = (self.end / self.start) - 1.0
 
     def stop(self):
+        equity = self.equity
+        if len(equity):
+            self.end = equity[-1]
         if self.start != 0:
             self.rtot = (self.end / self.start) - 1.0
 
@@ -0,0 +1,48 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .analyzer import Analyzer
+
+
+class RollingReturns(Analyzer):
+    """Return over the trailing ``window`` bars, for every bar (NaN until then)."""
+
+    vectorized = True
+
+    def __init__(self, strategy, window=252):
+        super().__init__(strategy)
+        self.window = window
+        self.rolling = pd.Series(dtype=float)
+
+        # running state (streaming): the last window + 1 values, new results
+        self._tail = deque(maxlen=window + 1)
+        self._dates = []
+        self._values = []
+
+    def next(self):
+        value = self.value
+        self._tail.append(value)
+        full = len(self._tail) > self.window
+        self._dates.append(self.strategy.datetime.datetime(0))
+        self._values.append(value / self._tail[0] - 1.0 if full else np.nan)
+
+    def stop(self):
+        equity = pd.Series(self.equity, index=self.dates)
+        self.rolling = equity / equity.shift(self.window) - 1.0
+        self._tail.clear()
+        self._tail.extend(self.equity[-(self.window + 1):].tolist())
+        self._dates, self._values = [], []
+
+    def getstate(self):
+        self.get_analysis()  # streamed bars into the series first
+        return super().getstate()
+
+    def get_analysis(self):
+        if self._values:
+            # fold the streamed bars into the series once, when read
+            streamed = pd.Series(self._values, index=pd.DatetimeIndex(self._dates))
+            self.rolling = pd.concat([self.rolling, streamed]) if len(self.rolling) else streamed
+            self._dates, self._values = [], []
+        return self.rolling
@@ -0,0 +1,57 @@
+import numpy as np
+
+from .analyzer import Analyzer
+
+
+class SharpeRatio(Analyzer):
+    """Annualized Sharpe ratio of the bar returns."""
+
+    vectorized = True
+
+    def __init__(self, strategy, riskfreerate=0.0, periods_per_year=252):
+        super().__init__(strategy)
+        self.riskfreerate = riskfreerate  # annual
+        self.periods_per_year = periods_per_year
+        self.sharperatio = None
+
+        # running state (streaming): previous value, Welford count / mean / M2
+        self._prev = self.start_value
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def _ratio(self):
+        if self._n < 2:
+            return None
+        std = np.sqrt(self._m2 / (self._n - 1))
+        if std > 0:
+            return float(self._mean / std * np.sqrt(self.periods_per_year))
+        return None
+
+    def _add(self, excess):
+        self._n += 1
+        delta = excess - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (excess - self._mean)
+
+    def next(self):
+        value = self.value
+        self._add(value / self._prev - 1.0 - self.riskfreerate / self.periods_per_year)
+        self._prev = value
+        self.sharperatio = self._ratio()
+
+    def stop(self):
+        excess = self.returns() - self.riskfreerate / self.periods_per_year
+        if not len(excess):
+            return
+
+        # the same recurrence as next(): a streamed or resumed run ends on
+        # the same bits as a backtest over the same bars
+        self._n, self._mean, self._m2 = 0, 0.0, 0.0
+        for x in excess.tolist():
+            self._add(x)
+        self._prev = float(self.equity[-1])
+        self.sharperatio = self._ratio()
+
+    def get_analysis(self):
+        return {"sharperatio": self.sharperatio}
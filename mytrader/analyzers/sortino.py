@@ -0,0 +1,53 @@
+import numpy as np
+
+from .analyzer import Analyzer
+
+
+class SortinoRatio(Analyzer):
+    """Annualized Sortino ratio: mean excess return over downside deviation."""
+
+    vectorized = True
+
+    def __init__(self, strategy, riskfreerate=0.0, periods_per_year=252):
+        super().__init__(strategy)
+        self.riskfreerate = riskfreerate  # annual
+        self.periods_per_year = periods_per_year
+        self.sortinoratio = None
+
+        # running state (streaming): previous value, count, sums
+        self._prev = self.start_value
+        self._n = 0
+        self._sum = 0.0
+        self._down2 = 0.0  # sum of squared negative excess returns
+
+    def _add(self, excess):
+        self._n += 1
+        self._sum += excess
+        self._down2 += min(excess, 0.0) ** 2
+
+    def _ratio(self):
+        if self._n < 2 or not self._down2 > 0:
+            return None
+        downside = np.sqrt(self._down2 / self._n)
+        return float(self._sum / self._n / downside * np.sqrt(self.periods_per_year))
+
+    def next(self):
+        value = self.value
+        self._add(value / self._prev - 1.0 - self.riskfreerate / self.periods_per_year)
+        self._prev = value
+        self.sortinoratio = self._ratio()
+
+    def stop(self):
+        excess = self.returns() - self.riskfreerate / self.periods_per_year
+        if not len(excess):
+            return
+
+        # the same sums as next() (see SharpeRatio.stop)
+        self._n, self._sum, self._down2 = 0, 0.0, 0.0
+        for x in excess.tolist():
+            self._add(x)
+        self._prev = float(self.equity[-1])
+        self.sortinoratio = self._ratio()
+
+    def get_analysis(self):
+        return {"sortinoratio": self.sortinoratio}
@@ -1,20 +1,56 @@
+import numpy as np
+
+from .ledger import FillLedger
 from .order import Order
 from .position import Position
 
 
 class Broker:
+    """
+    Position sizes are mirrored in a vector (one slot per feed, in
+    Cerebro.datas order), so getvalue() is a dot product with the bar's
+    close vector. Under Cerebro the value is cached for the bar and
+    recomputed only after a fill or a cash change: ``cash`` and
+    ``Position.size`` are properties that drop the cache when assigned.
+
+    Every fill is also appended to ``self.ledger`` (a FillLedger).
+    """
+
     def __init__(self, cash):
+        self._value = None
         self.cash = float(cash)
         self.positions = {}
         self.pending = []
         self.use_open = False
 
+        self._slots = {}  # data -> index into _sizes
+        self._datas = []
+        self._sizes = np.zeros(0)
+
+        self._closes = None  # aligned close matrix (bar, slot), set by Cerebro
+        self._prices = None  # current bar's row of _closes
+
+        self.ledger = FillLedger()
+
     def submit(self, order):
         self.pending.append(order)
         return order
 
     def getposition(self, data):
-        return self.positions.setdefault(data, Position())
+        pos = self.positions.get(data)
+        if pos is None:
+            pos = self.positions[data] = Position(self, data)
+            self._slot(data)
+        return pos
+
+    @property
+    def cash(self):
+        return self._cash
+
+    @cash.setter
+    def cash(self, cash):
+        self._cash = cash
+        self._value = None
 
     def getcash(self):
         return self.cash
@@ -23,12 +59,93 @@ class Broker:
         self.cash = float(cash)
 
     def getvalue(self):
-        value = self.cash
-        for d, p in self.positions.items():
-            if p.size != 0 and getattr(d, "idx", -1) >= 0:
-                value += p.size * d.close[0]
+        if self._value is not None:
+            return self._value
+
+        prices = self._prices
+        cached = prices is not None and len(prices) == len(self._sizes)
+        if not cached:
+            prices = self._gather_prices()
+
+        value = self.cash + float(self._sizes @ prices)
+        if cached:
+            self._value = value
         return value
 
+    # =========================
+    # Size vector / price binding
+    # =========================
+    def _slot(self, data):
+        slot = self._slots.get(data)
+        if slot is None:
+            slot = self._slots[data] = len(self._datas)
+            self._datas.append(data)
+            self._sizes = np.append(self._sizes, 0.0)
+        return slot
+
+    def _sized(self, data, size):
+        # Position.size setter
+        self._sizes[self._slot(data)] = size
+        self._value = None
+
+    def _bind(self, datas, closes):
+        """
+        Cerebro.run: slots follow ``datas``; ``closes[bar, j]`` is the close
+        of datas[j] on master bar ``bar`` (see mark_prices).
+        """
+        extra = [d for d in self._datas if d not in set(datas)]
+        self._datas = list(datas) + extra
+        self._slots = {d: j for j, d in enumerate(self._datas)}
+        self._sizes = np.array(
+            [self.positions[d].size if d in self.positions else 0.0 for d in self._datas],
+            dtype=np.float64,
+        )
+        self._closes = closes
+        self._prices = None
+        self._value = None
+
+    def _next_bar(self, bar):
+        self._prices = self._closes[bar]
+        self._value = None
+
+    def _gather_prices(self):
+        # standalone use (no Cerebro): read every feed's current close
+        return np.array([_last_close(d) for d in self._datas], dtype=np.float64)
+
+    # =========================
+    # Checkpoints
+    # =========================
+    def getstate(self):
+        """Cash, sizes and pending orders by data name, and the fill ledger."""
+        return dict(
+            cash=self.cash,
+            use_open=self.use_open,
+            positions={d._name: p.size for d, p in self.positions.items() if p.size != 0},
+            pending=[
+                (o.data._name, o.side, o.created.size, o.created.target_pct, o.created.price)
+                for o in self.pending
+            ],
+            ledger=self.ledger.getstate(),
+        )
+
+    def setstate(self, state, datasbyname, strategy):
+        """Restore getstate() output onto the datas named there."""
+        self.cash = state["cash"]
+        self.use_open = state["use_open"]
+
+        for name, size in state["positions"].items():
+            data = datasbyname[name]
+            self.getposition(data).size = size
+
+        self.pending = [
+            Order(datasbyname[name], side=side, size=size, target_pct=target_pct,
+                  price=price, strategy=strategy)
+            for name, side, size, target_pct, price in state["pending"]
+        ]
+
+        self.ledger.setstate(state["ledger"], datasbyname)
+        self._value = None
+
     def execute_pending(self):
         # 1️⃣ execute all SELL orders
         for o in list(self.pending):
@@ -68,6 +185,8 @@ class Broker:
         o.executed.price = price
         o.executed.dt = o.data.datetime.datetime(0)
 
+        self.ledger.append(o.executed.dt, o.data, Order.SELL, size, price, self.cash)
+
         o.strategy.notify_order(o)
 
     def _execute_buy(self, o):
@@ -107,7 +226,7 @@ class Broker:
 
         cost = size * price
         self.cash -= cost
-        pos.size += size
+        pos.size = pos.size + size
 
         # snapshot execution values ONCE
         exec_dt = o.data.datetime.datetime(0)
@@ -119,4 +238,33 @@ class Broker:
         o.executed.price = exec_price
         o.executed.dt = exec_dt
 
+        self.ledger.append(exec_dt, o.data, Order.BUY, exec_size, exec_price, self.cash)
+
         o.strategy.notify_order(o)
+
+
+def mark_prices(closes):
+    """
+    Prices positions are valued at, from closes by bar (rows) and data
+    (columns): a NaN close carries the data's last valid close forward,
+    and bars before its first valid close price at 0 (nothing is held).
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    valid = closes == closes
+    last = np.where(valid, np.arange(len(closes))[:, None], -1)
+    np.maximum.accumulate(last, axis=0, out=last)
+    marks = np.take_along_axis(closes, np.maximum(last, 0), axis=0)
+    marks[last < 0] = 0.0
+    return marks
+
+
+def _last_close(data):
+    """The data's current close, or its last valid one (0 before the first)."""
+    i = getattr(data, "idx", -1)
+    if i < 0:
+        return 0.0
+    close = data.close[0]
+    if close == close:
+        return close
+    valid = np.flatnonzero(~np.isnan(data.close.array[:i]))
+    return float(data.close.array[valid[-1]]) if len(valid) else 0.0
@@ -1,13 +1,39 @@
-from .broker import Broker
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from . import checkpoint as _checkpoint
+from .broker import Broker, mark_prices
 from .context import StrategyContext
+from .feeds import LiveData, ResampledData
+from .ind.indicator import IndicatorRegistry
+from .optimizer import run_sweep
+from .profiler import BarProfiler
+from .strategy import Params
+from .tradelog import DEBUG, BufferedSink, TradeLogger
 
 class Cerebro:
-    def __init__(self, cash=10000.0):
+    def __init__(self, cash=10000.0, loglevel=DEBUG, logfile=None):
+        """
+        loglevel: tradelog.SILENT / INFO / DEBUG for strategy logs.
+        logfile: path the logs are written to (default stdout); the lines
+                 are then not also kept in memory (log_lines is None).
+        """
         self.datas = []
         self.datasbyname = {}
         self._strategies = []
+        self._optstrategy = None
         self._analyzers = []
         self.broker = Broker(cash)
+        self.brokers = [self.broker]  # one per strategy, set by run()
+        self.indicators = IndicatorRegistry()
+        self._running = []  # strategies of the current run
+        self._streaming = False
+        self._stopped = False
+        self.profiler = None
+        self.loglevel = loglevel
+        self.logfile = logfile
 
     def adddata(self, data, name=None):
         data._name = name
@@ -15,59 +41,351 @@ class Cerebro:
         if name:
             self.datasbyname[name] = data
 
+    def resampledata(self, data, rule="1D", name=None):
+        """
+        Add ``data`` resampled to ``rule`` (e.g. "1h", "1D") as a feed of
+        its own. The master clock (first data) should be the finest feed.
+        """
+        resampled = ResampledData(data, rule)
+        self.adddata(resampled, name=name)
+        return resampled
+
     def addstrategy(self, stratcls, **params):
         self._strategies.append((stratcls, params))
 
-    def addanalyzer(self, analyzercls, _name=None):
-        self._analyzers.append((_name, analyzercls))
+    def optstrategy(self, stratcls, **params):
+        """
+        Backtrader-style sweep: every param may be an iterable of values;
+        run() then executes one backtest per combination.
+        """
+        self._optstrategy = (stratcls, params)
 
-    def run(self):
-        strategies = []
+    def addanalyzer(self, analyzercls, _name=None, **kwargs):
+        self._analyzers.append((_name, analyzercls, kwargs))
 
-        for stratcls, params in self._strategies:
-            # 1️⃣ Allocate WITHOUT calling __init__
-            strat = stratcls.__new__(stratcls)
+    def _build_alignment(self, dates):
+        """
+        Integer alignment matrix: ``alignment[bar, j]`` is the row of
+        ``self.datas[j]`` to use on master bar ``bar`` (-1 before its first row).
+        """
+        alignment = np.empty((len(dates), len(self.datas)), dtype=np.int64)
+        for j, d in enumerate(self.datas):
+            alignment[:, j] = d._align_to(dates)
+        return alignment
 
-            # 2️⃣ Inject engine context BEFORE __init__
-            strat.broker = self.broker
-            strat.cerebro = self
-            strat.datas = self.datas
-            strat.data = self.datas[0]
-            strat.data0 = self.datas[0]
-            strat.datetime = strat.data.datetime
+    def _build_closes(self, alignment):
+        """Price of every data on every master bar for valuation (mark_prices)."""
+        closes = np.full(alignment.shape, np.nan)
+        for j, d in enumerate(self.datas):
+            rows = alignment[:, j]
+            valid = rows >= 0
+            closes[valid, j] = d.close.array[rows[valid]]
+        return mark_prices(closes)
 
-            # 3️⃣ Backtrader-style params
-            strat.p = type("Params", (), strat.params | params)()
+    def run(self, maxcpus=None, profile=False, fast=False):
+        """
+        Run the added strategies and return them.
 
-            # 4️⃣ NOW call user __init__
-            with StrategyContext(strat):
-                strat.__init__()
+        All strategies share one pass over the feeds and any identical
+        indicators (``self.indicators``), but each trades its own broker:
+        the first uses ``self.broker``, the others a new Broker with the
+        same starting cash and settings (``strategy.broker``).
 
-            # 5️⃣ Init analyzers
-            strat._init_analyzers(self._analyzers)
+        profile=True times every bar phase, indicator and analyzer; the
+        BarProfiler is left on ``self.profiler`` (summary(), to_chrome_trace()).
 
-            strategies.append(strat)
+        After optstrategy(), runs the parameter sweep instead (on up to
+        ``maxcpus`` processes) and returns its results table; fast=True
+        runs each combination through mytrader.fastpath.
+        """
+        if self._optstrategy is not None:
+            stratcls, params = self._optstrategy
+            return run_sweep(self, stratcls, params, maxcpus=maxcpus, fast=fast)
+
+        self.start(profile=profile)
+        return self.stop()
+
+    # =========================
+    # Streaming
+    # =========================
+    def start(self, profile=False):
+        """
+        Build the strategies and run them over the bars the feeds hold now.
+        Returns the strategies; push() can then stream further bars, and
+        stop() ends the run (run() is start() + stop()).
+        """
+        strategies = self._build(profile)
+
+        try:
+            for bar in range(len(self.datas[0])):
+                self._run_bar(bar, strategies, self.profiler)
+        except BaseException:
+            # the lines logged just before a crash are the ones to debug it with
+            self._sink.close()
+            raise
 
+        self._running = strategies
+        self._streaming = False
+        return strategies
+
+    def _build(self, profile=False):
+        """Strategies, brokers, indicator registry, clock and log sink for a run."""
         # Use first data as master clock (Backtrader default)
         master = self.datas[0]
-        dates = master.df.index
+        dates = master.index
 
-        for dt in dates:
-            # advance each data by DATE, not index
-            for d in self.datas:
-                d._advance_to_date(dt)
+        prof = self.profiler = BarProfiler(len(dates)) if profile else None
 
-            self.broker.execute_pending()
+        strategies = []
+        sink = self._sink = BufferedSink(self.logfile)
+        self._stopped = False
 
-            for strat in strategies:
-                strat._evaluate_indicators()
-                strat.next()
-                for a in strat.analyzers.values():
-                    a.next()
+        self.indicators = IndicatorRegistry()
+        self.brokers = self._make_brokers(len(self._strategies))
 
-        for strat in strategies:
+        for (stratcls, params), broker in zip(self._strategies, self.brokers):
+            logger = TradeLogger(self.loglevel, sink)
+            strat = self._build_strategy(stratcls, params, logger, prof, broker)
+            strategies.append(strat)
+
+        self._prepare_clock()
+        return strategies
+
+    def push(self, dt, bars):
+        """
+        Stream one master bar: append ``bars`` (data name -> bar, see
+        LiveData.append) at ``dt`` and run the strategies on it. The master
+        data (datas[0]) must be among them; other feeds carry forward.
+        Starts the run first if start() was not called.
+        """
+        if not self._streaming:
+            if not self._running:
+                self.start()
+            self._go_live()
+
+        stamp = pd.Timestamp(dt)
+        for name, bar in bars.items():
+            data = self.datasbyname[name]
+            if not isinstance(data, LiveData):
+                raise TypeError(f"data {name!r} is not a LiveData feed")
+            data.append(stamp, bar)
+
+        bar = self._nbars
+        if len(self.datas[0]) != bar + 1:
+            raise ValueError(f"no master data bar at {stamp}")
+
+        self._grow_clock(bar + 1)
+        for j, d in enumerate(self.datas):
+            row = d._row_at(stamp)
+            close = d.close.array[row] if row >= 0 else float("nan")
+            if close != close:
+                # mark_prices: carry the last valid close (0 before the first)
+                close = self._closes[bar - 1, j] if bar else 0.0
+            self._alignment[bar, j] = row
+            self._closes[bar, j] = close
+        self.alignment = self._alignment[:bar + 1]
+        self._nbars = bar + 1
+
+        for strat in self._running:
+            strat._grow_equity(bar + 1)
+        try:
+            self._run_bar(bar, self._running)
+            for strat in self._running:
+                strat._after_bar()
+        except BaseException:
+            self._sink.close()
+            raise
+
+    def _go_live(self):
+        if self.profiler is not None:
+            raise ValueError("profiling covers start() only; stream without profile=True")
+
+        # vectorized analyzers catch up once, then update per bar
+        for strat in self._running:
             for a in strat.analyzers.values():
-                a.stop()
-            strat.stop()
+                if a.vectorized:
+                    a.stop()
+            strat._bar_analyzers = list(strat.analyzers.items())
+
+        self._streaming = True
+
+    def stop(self):
+        """Finish the run started by start(): analyzers, strategies, logs."""
+        strategies = self._running
+
+        try:
+            for strat in strategies:
+                for name, a in strat.analyzers.items():
+                    # streamed vectorized analyzers are already up to date
+                    if not (self._streaming and a.vectorized):
+                        # vectorized analyzers do all their work here
+                        with strat.section(f"analyzer:{name}"):
+                            a.stop()
+                strat.stop()
+        finally:
+            self._sink.close()
+        self._stopped = True
+
+        if self.profiler is not None:
+            self.profiler.stop()
 
         return strategies
+
+    # =========================
+    # Checkpoints
+    # =========================
+    def checkpoint(self, path, keep=256):
+        """
+        Save the finished run (after run() or stop()) for resume(): see
+        mytrader.checkpoint. ``keep``: bars kept per feed (at least the
+        longest indicator window).
+        """
+        return _checkpoint.save(self, path, keep)
+
+    def resume(self, path):
+        """
+        Continue from checkpoint ``path`` instead of start(): add the same
+        strategies and analyzers but no data (the checkpoint's feeds are
+        added as LiveData), then push() the new bars and stop().
+        """
+        return _checkpoint.restore(self, _checkpoint.load(path))
+
+    def runstream(self, source):
+        """
+        start(), push() every ``(dt, bars)`` event of ``source``, stop().
+        ``source`` is an iterable (e.g. a generator) or a queue.Queue read
+        until a None sentinel. Returns the strategies.
+        """
+        self.start()
+        if hasattr(source, "get") and not hasattr(source, "__iter__"):
+            source = iter(source.get, None)
+        for dt, bars in source:
+            self.push(dt, bars)
+        return self.stop()
+
+    async def arunstream(self, source):
+        """runstream() for an async iterable or an asyncio.Queue (None ends it)."""
+        self.start()
+        if hasattr(source, "__aiter__"):
+            async for dt, bars in source:
+                self.push(dt, bars)
+        else:
+            while (event := await source.get()) is not None:
+                self.push(*event)
+        return self.stop()
+
+    def _grow_clock(self, nbars):
+        """Room for ``nbars`` master bars in the alignment and close matrices."""
+        if nbars <= len(self._alignment):
+            return
+
+        size = max(2 * len(self._alignment), nbars, 16)
+        alignment = np.empty((size, len(self.datas)), dtype=np.int64)
+        closes = np.zeros((size, len(self.datas)), dtype=np.float64)
+        alignment[:self._nbars] = self._alignment[:self._nbars]
+        closes[:self._nbars] = self._closes[:self._nbars]
+
+        self._alignment, self._closes = alignment, closes
+        for broker in self.brokers:
+            broker._closes = closes
+
+    def _make_brokers(self, n):
+        """self.broker plus a fresh copy of its cash and settings per extra strategy."""
+        brokers = [self.broker]
+        for _ in range(n - 1):
+            broker = Broker(self.broker.getcash())
+            broker.use_open = self.broker.use_open
+            brokers.append(broker)
+        return brokers
+
+    def _build_strategy(self, stratcls, params, logger, prof=None, broker=None):
+        # 1️⃣ Allocate WITHOUT calling __init__
+        strat = stratcls.__new__(stratcls)
+
+        # 2️⃣ Inject engine context BEFORE __init__
+        strat.broker = broker or self.broker
+        strat.cerebro = self
+        strat.datas = self.datas
+        strat.data = self.datas[0]
+        strat.data0 = self.datas[0]
+        strat.datetime = strat.data.datetime
+        strat.logger = logger
+
+        # 3️⃣ Backtrader-style params
+        strat.p = Params(**(strat.params | params))
+
+        # 4️⃣ NOW call user __init__
+        with StrategyContext(strat):
+            strat.__init__()
+
+        if prof is not None:
+            strat._profiler = prof
+            for ind in getattr(strat, "_indicators", []):
+                ind._profiler = prof
+
+        strat._start_indicators()
+
+        # 5️⃣ Init analyzers (+ the equity curve vectorized ones read)
+        strat._init_equity(len(self.datas[0]))
+        strat._init_analyzers(self._analyzers)
+
+        return strat
+
+    def _prepare_clock(self):
+        """Alignment matrix and the brokers' close matrix for the master bars."""
+        self.alignment = self._build_alignment(self.datas[0].index)
+        closes = self._build_closes(self.alignment)
+        for broker in self.brokers:
+            broker._bind(self.datas, closes)
+
+        # growable copies for streamed bars (see push)
+        self._alignment, self._closes = self.alignment, closes
+        self._nbars = len(self.alignment)
+
+    def _run_bar(self, bar, strategies, prof=None):
+        # unprofiled runs read a dummy clock: one trivial call per phase
+        clock = _no_clock if prof is None else perf_counter
+
+        t0 = clock()
+
+        # advance each data by DATE, not index (precomputed, carry-forward)
+        for d, i in zip(self.datas, self.alignment[bar].tolist()):
+            d._advance(i)
+        for broker in self.brokers:
+            broker._next_bar(bar)
+
+        t1 = clock()
+
+        for broker in self.brokers:
+            broker.execute_pending()
+
+        t2 = clock()
+        t_next = t_analyzers = 0.0
+
+        for strat in strategies:
+            s0 = clock()
+            strat.next()
+            s1 = clock()
+
+            # one broker read per bar; vectorized analyzers use it at stop()
+            strat.equity[bar] = strat.broker.getvalue()
+            strat._equity_len = bar + 1
+
+            for name, a in strat._bar_analyzers:
+                a0 = clock()
+                a.next()
+                if prof is not None:
+                    prof.add(f"analyzer:{name}", a0, clock())
+
+            t_next += s1 - s0
+            t_analyzers += clock() - s1
+
+        if prof is not None:
+            prof.record(bar, 0, t0, t1)
+            prof.record(bar, 1, t1, t2)
+            prof.record(bar, 2, t2, t2 + t_next)
+            prof.record(bar, 3, t2 + t_next, t2 + t_next + t_analyzers)
+
+
+def _no_clock():
+    return 0.0
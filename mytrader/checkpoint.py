@@ -0,0 +1,228 @@
+"""
+Warm-start checkpoints: the state of a finished run, so a later run
+processes only the bars that came after it.
+
+    cerebro.run()
+    cerebro.checkpoint("ftlt.ckpt")
+
+    # later: same strategies / analyzers, no data added
+    cerebro = Cerebro(...)
+    cerebro.addstrategy(...)
+    cerebro.resume("ftlt.ckpt")
+    for dt, bars in frame_bars(frames, after=cerebro.datas[0].index[-1]):
+        cerebro.push(dt, bars)
+    cerebro.stop()
+
+A checkpoint holds the last ``keep`` bars of every feed (the lookback the
+indicators continue from), each indicator's latest values and streaming
+state, and per strategy its broker (cash, positions, pending orders,
+fills), equity tail, checkpoint_attrs and analyzer state. It is a pickle:
+only load checkpoints you wrote.
+
+compare(a, b) lists the differences between two checkpoints, e.g. a
+resumed run against a full rerun over the same bars.
+"""
+import math
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .feeds import LiveData
+
+VERSION = 1
+
+_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _strategy_key(stratcls, params):
+    return f"{stratcls.__module__}.{stratcls.__qualname__}", dict(params)
+
+
+def _indicator_table(strategies):
+    """Every indicator once (shared ones too), and each strategy's list as table positions."""
+    table, slots, layout = [], {}, []
+    for strat in strategies:
+        positions = []
+        for ind in getattr(strat, "_indicators", []):
+            if id(ind) not in slots:
+                slots[id(ind)] = len(table)
+                table.append(ind)
+            positions.append(slots[id(ind)])
+        layout.append(positions)
+    return table, layout
+
+
+def save(cerebro, path, keep=256):
+    strategies = cerebro._running
+    if not cerebro._stopped:
+        raise RuntimeError("checkpoint a finished run (after run() or stop())")
+    if any(d._name is None for d in cerebro.datas):
+        raise ValueError("checkpoints need every data added with a name")
+
+    table, layout = _indicator_table(strategies)
+
+    # enough rows for every indicator's window
+    need = max(
+        (getattr(ind, "period", 0) + getattr(ind, "lookback", 0) for ind in table),
+        default=0,
+    )
+    keep = max(keep, need + 1)
+
+    feeds, kept = [], {}
+    for d in cerebro.datas:
+        n = len(d)
+        k = kept[d] = min(keep, n)
+        index = d.index[n - k:]
+        feeds.append(dict(
+            name=d._name,
+            tz=None if index.tz is None else str(index.tz),
+            stamps=index.as_unit("ns").asi8.copy(),
+            columns={name: np.array(getattr(d, name).array[n - k:]) for name in _COLUMNS},
+        ))
+
+    indicators = [ind.getstate(kept[ind.data]) for ind in table]
+
+    nbars = kept[cerebro.datas[0]]
+    states = []
+    for (stratcls, params), strat, positions in zip(cerebro._strategies, strategies, layout):
+        end = strat._equity_len
+        states.append(dict(
+            key=_strategy_key(stratcls, params),
+            broker=strat.broker.getstate(),
+            equity=strat.equity[end - nbars:end].copy(),
+            state=strat.getstate(),
+            analyzers={name: (type(a).__name__, a.getstate()) for name, a in strat.analyzers.items()},
+            indicators=positions,
+        ))
+
+    ckpt = dict(
+        version=VERSION,
+        last=cerebro.datas[0].index[-1],
+        feeds=feeds,
+        indicators=indicators,
+        strategies=states,
+    )
+    with open(path, "wb") as f:
+        pickle.dump(ckpt, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        ckpt = pickle.load(f)
+    if ckpt.get("version") != VERSION:
+        raise ValueError(f"unsupported checkpoint version {ckpt.get('version')!r}")
+    return ckpt
+
+
+def restore(cerebro, ckpt):
+    """Rebuild ``cerebro`` at the checkpoint's last bar (Cerebro.resume)."""
+    if cerebro.datas:
+        raise ValueError("resume() adds the checkpoint's feeds: add no data")
+
+    keys = [_strategy_key(cls, params) for cls, params in cerebro._strategies]
+    if keys != [s["key"] for s in ckpt["strategies"]]:
+        raise ValueError("the strategies (or their params) differ from the checkpoint's")
+
+    for feed in ckpt["feeds"]:
+        index = pd.DatetimeIndex(feed["stamps"].view("M8[ns]"), name="datetime")
+        if feed["tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(feed["tz"])
+        cerebro.adddata(LiveData(pd.DataFrame(feed["columns"], index=index)), name=feed["name"])
+
+    strategies = cerebro._build()
+
+    table, layout = _indicator_table(strategies)
+    for strat, positions, saved in zip(strategies, layout, ckpt["strategies"]):
+        if positions != saved["indicators"]:
+            raise ValueError(f"{type(strat).__name__} builds other indicators than the checkpoint's")
+    for ind, state in zip(table, ckpt["indicators"]):
+        ind.setstate(state)
+
+    for strat, saved in zip(strategies, ckpt["strategies"]):
+        strat.broker.setstate(saved["broker"], cerebro.datasbyname, strat)
+
+        n = len(saved["equity"])
+        strat.equity[:n] = saved["equity"]
+        strat._equity_len = n
+
+        strat.setstate(saved["state"])
+
+        analyzers = saved["analyzers"]
+        if sorted(analyzers) != sorted(strat.analyzers):
+            raise ValueError("the analyzers differ from the checkpoint's")
+        for name, a in strat.analyzers.items():
+            a.setstate(analyzers[name][1])
+
+        # restored analyzers are up to date: from here on they stream
+        strat._bar_analyzers = list(strat.analyzers.items())
+
+    cerebro._running = strategies
+    cerebro._streaming = True
+    return strategies
+
+
+# =========================
+# Verification
+# =========================
+def _fields(obj):
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    slots = getattr(type(obj), "__slots__", ())
+    return {name: getattr(obj, name) for name in slots if hasattr(obj, name)}
+
+
+def _diff(a, b, path, out, rtol):
+    if isinstance(a, dict) and isinstance(b, dict):
+        for k in a.keys() | b.keys():
+            if k not in a or k not in b:
+                out.append(f"{path}.{k}: only in one checkpoint")
+            else:
+                _diff(a[k], b[k], f"{path}.{k}", out, rtol)
+    elif isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        if len(a) != len(b):
+            out.append(f"{path}: length {len(a)} != {len(b)}")
+        else:
+            for i, (x, y) in enumerate(zip(a, b)):
+                _diff(x, y, f"{path}[{i}]", out, rtol)
+    elif isinstance(a, (pd.Series, pd.Index)):
+        _diff(np.asarray(a), np.asarray(b), path, out, rtol)
+    elif isinstance(a, np.ndarray) and isinstance(b, np.ndarray):
+        if a.shape != b.shape:
+            out.append(f"{path}: shape {a.shape} != {b.shape}")
+        elif a.dtype.names:
+            for name in a.dtype.names:
+                _diff(a[name], b[name], f"{path}.{name}", out, rtol)
+        elif a.dtype.kind == "f":
+            if not np.allclose(a, b, rtol=rtol, atol=0.0, equal_nan=True):
+                out.append(f"{path}: arrays differ")
+        elif not np.array_equal(a, b):
+            out.append(f"{path}: arrays differ")
+    elif isinstance(a, float) and isinstance(b, float):
+        if not (math.isclose(a, b, rel_tol=rtol) or (a != a and b != b)):
+            out.append(f"{path}: {a!r} != {b!r}")
+    elif not _equal(a, b):
+        if type(a) is type(b) and _fields(a):
+            _diff(_fields(a), _fields(b), path, out, rtol)
+        else:
+            out.append(f"{path}: {a!r} != {b!r}")
+
+
+def _equal(a, b):
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):  # e.g. objects holding arrays
+        return False
+
+
+def compare(a, b, rtol=0.0):
+    """
+    Differences between two checkpoints (paths or loaded), one line each;
+    empty when they agree. Streamed and precomputed values are bit-exact,
+    so floats must match exactly unless ``rtol`` is given.
+    """
+    a = load(a) if not isinstance(a, dict) else a
+    b = load(b) if not isinstance(b, dict) else b
+    out = []
+    _diff(a, b, "checkpoint", out, rtol)
+    return out
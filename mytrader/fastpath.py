@@ -0,0 +1,176 @@
+"""
+Vectorized engine for single-asset switching strategies.
+
+A strategy that always holds 100% of one asset, chosen by its state, and
+only trades when the state changes (MT_TQQQFTLT_COC) can be backtested
+from its state sequence alone:
+
+    result = fastpath.backtest(cerebro)       # strategy added with addstrategy
+    result.final_value, result.car_pct, result.max_dd_pct, result.trades
+
+The strategy must provide ``resolve_states()`` (one state per master bar,
+see MT_TQQQFTLT_COC) and ``state_assets`` (state -> data name). Fills follow
+Broker: orders decided on bar t fill on bar t+1 at bar t's close, sells
+first, then an all-in buy of whole shares (fractional only below one
+share) with the remainder left in cash. Only the trades are a Python loop;
+the equity curve and drawdown are array operations.
+
+check_parity(cerebro) runs both engines and compares the equity curves.
+"""
+import numpy as np
+import pandas as pd
+
+from .analyzers.analyzer import drawdowns
+from .broker import mark_prices
+from .tradelog import SILENT, BufferedSink, TradeLogger
+
+
+class SwitchResult:
+    def __init__(self, dates, equity, trades, start, cash):
+        self.dates = dates
+        self.equity = equity  # broker value on every master bar
+        self.trades = trades  # DataFrame, one row per fill
+        self.start = start
+        self.cash = cash
+
+        self.final_value = float(equity[-1]) if len(equity) else cash
+
+        # same as the DrawDown analyzer: running peak starts at the cash
+        _, self.drawdown, _ = drawdowns(equity, cash)
+        self.max_dd_pct = float(self.drawdown.max()) if len(equity) else 0.0
+
+        # CAR from the trading start (or first bar) to the last bar
+        years = (dates[-1].date() - start).days / 365.25
+        self.car_pct = (
+            ((self.final_value / cash) ** (1 / years) - 1) * 100 if years > 0 else float("nan")
+        )
+
+    def equity_series(self):
+        return pd.Series(self.equity, index=self.dates, name="equity")
+
+
+def _aligned_closes(cerebro):
+    """Close of every data on every master bar, NaN before its first row."""
+    alignment = cerebro.alignment
+    closes = np.full(alignment.shape, np.nan)
+    for j, d in enumerate(cerebro.datas):
+        rows = alignment[:, j]
+        valid = rows >= 0
+        closes[valid, j] = d.close.array[rows[valid]]
+    return closes
+
+
+def run_switching(cerebro, states, state_assets, start=None):
+    """
+    Backtest a state sequence (one state per master bar of ``cerebro``)
+    where each state holds 100% of ``state_assets[state]``. Bars before
+    the ``start`` date make no decisions (MTBaseStrategy's trade_start).
+    Uses the broker's cash; does not modify the broker.
+    """
+    if not hasattr(cerebro, "alignment"):
+        cerebro._prepare_clock()
+
+    dates = cerebro.datas[0].index
+    n = len(dates)
+    cash0 = cash = cerebro.broker.getcash()
+
+    slot = {d._name: j for j, d in enumerate(cerebro.datas)}
+    closes = _aligned_closes(cerebro)  # order prices: data.close[0]
+    marks = mark_prices(closes)        # valuation: what Broker.getvalue() uses
+
+    start_bar = 0
+    if start is not None:
+        start_bar = int(np.searchsorted(dates, pd.Timestamp(start)))
+    else:
+        start = dates[0].date()
+
+    # decision bars: the first traded bar, then every state change
+    changes = [t for t in range(start_bar, n) if t == start_bar or states[t] != states[t - 1]]
+
+    held, shares = None, 0.0
+    fills = []      # (bar, asset, size, price, cash after)
+    segments = []   # (first bar, cash, shares, asset slot) after each fill bar
+
+    for t in changes:
+        target = slot[state_assets[states[t]]]
+        if held == target:
+            continue
+        if t + 1 >= n:
+            break  # decided on the last bar: never filled
+
+        # 1️⃣ SELL FIRST, at the decision bar's close
+        if held is not None and shares != 0:
+            price = closes[t, held]
+            cash -= -shares * price
+            fills.append((t + 1, held, -shares, price, cash))
+            held, shares = None, 0.0
+
+        # 2️⃣ BUY 100% (Broker._execute_buy with nothing else held)
+        price = closes[t, target]
+        delta = cash * 1.0
+        size = delta / price if abs(delta) >= 1e-12 else 0.0
+        if size > 0:
+            size = min(size, cash / price)
+            if size >= 1:
+                size = int(size)
+            if abs(size) >= 1e-12:
+                cash -= size * price
+                held, shares = target, size
+                fills.append((t + 1, target, size, price, cash))
+
+        segments.append((t + 1, cash, shares, held if held is not None else 0))
+
+    # equity: each segment holds its cash + shares from its fill bar on
+    equity = np.full(n, cash0, dtype=np.float64)
+    if segments:
+        first, seg_cash, seg_shares, seg_slot = (np.array(c) for c in zip(*segments))
+        k = np.searchsorted(first, np.arange(n), side="right") - 1
+        on = k >= 0
+        kk = k[on]
+        equity[on] = seg_cash[kk] + seg_shares[kk] * marks[np.flatnonzero(on), seg_slot[kk]]
+
+    names = [d._name for d in cerebro.datas]
+    trades = pd.DataFrame(
+        [
+            dict(
+                date=dates[bar], bar=bar, data=names[j],
+                side="BUY" if size > 0 else "SELL", size=size, price=price, cash=c,
+            )
+            for bar, j, size, price, c in fills
+        ],
+        columns=["date", "bar", "data", "side", "size", "price", "cash"],
+    )
+
+    return SwitchResult(dates, equity, trades, start, cash0)
+
+
+def _build(cerebro):
+    if len(cerebro._strategies) != 1:
+        raise ValueError("fastpath needs exactly one strategy (addstrategy)")
+
+    stratcls, params = cerebro._strategies[0]
+    cerebro._prepare_clock()
+    logger = TradeLogger(SILENT, BufferedSink())
+    return cerebro._build_strategy(stratcls, params, logger)
+
+
+def backtest(cerebro):
+    """Vectorized run of the single strategy added to ``cerebro``."""
+    strat = _build(cerebro)
+    states = strat.resolve_states()
+    start = getattr(strat.p, "trade_start", None)
+    return run_switching(cerebro, states, strat.state_assets, start)
+
+
+def check_parity(cerebro):
+    """
+    Run ``cerebro``'s strategy through backtest() and through Cerebro.run()
+    and compare the equity on every bar. Returns (ok, fast result, event
+    equity array); the broker is left as the event run leaves it.
+    """
+    fast = backtest(cerebro)
+    strat = cerebro.run()[0]
+
+    event = strat.equity[:strat._equity_len]
+    ok = len(event) == len(fast.equity) and np.array_equal(event, fast.equity)
+    return ok, fast, event
@@ -1 +1,4 @@
 from .pandasdata import PandasData
+from .livedata import LiveData, frame_bars
+from .mmapdata import MmapData, save_columns, save_frames
+from .resample import Resampler, ResampledData
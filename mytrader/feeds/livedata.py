@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from .pandasdata import DateTimeLine, Line, PandasData
+
+_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def frame_bars(frames, after=None):
+    """
+    Cerebro.push events ``(dt, bars)`` from ``{name: frame}``: one per row
+    of the first frame (the master) after ``after``, each with the bar of
+    every frame that has a row at that time.
+    """
+    names = list(frames)
+    dates = pd.DatetimeIndex(frames[names[0]].index)
+    if after is not None:
+        dates = dates[dates > pd.Timestamp(after)]
+
+    rows, values = {}, {}
+    for name, df in frames.items():
+        cols = {c.lower(): c for c in df.columns}
+        rows[name] = pd.DatetimeIndex(df.index).get_indexer(dates)
+        values[name] = np.column_stack([
+            df[cols[c]].to_numpy(dtype=np.float64) if c in cols else np.full(len(df), np.nan)
+            for c in _COLUMNS
+        ])
+
+    for t, dt in enumerate(dates):
+        bars = {
+            name: tuple(values[name][rows[name][t]].tolist())
+            for name in names if rows[name][t] >= 0
+        }
+        yield dt, bars
+
+
+class LiveData(PandasData):
+    """
+    Feed that grows while Cerebro runs: bars are appended one at a time
+    (Cerebro.push / runstream) on top of an optional history frame.
+
+    Columns live in buffers that double when full; the lines always view
+    the filled part, so appending a bar is O(1) amortized. The feed is not
+    static, so its indicators stream (next()) instead of precomputing.
+    """
+
+    static = False
+
+    def __init__(self, dataname=None, capacity=1024):
+        self.df = dataname
+        self.idx = -1
+        self._n = 0
+        self._index = None  # DatetimeIndex over the filled stamps, built on demand
+
+        n = 0 if dataname is None else len(dataname)
+        size = max(capacity, n)
+        self._stamps = np.empty(size, dtype=np.int64)
+        self._cols = {name: np.empty(size, dtype=np.float64) for name in _COLUMNS}
+        self.tz = None
+
+        self.open, self.high, self.low, self.close, self.volume = (
+            Line(self, self._cols[name][:0]) for name in _COLUMNS
+        )
+        self.datetime = DateTimeLine(self)
+
+        if dataname is not None:
+            history = PandasData(dataname)
+            index = pd.DatetimeIndex(history.index)
+            self.tz = None if index.tz is None else str(index.tz)
+            self._stamps[:n] = index.as_unit("ns").asi8
+            for name in _COLUMNS:
+                self._cols[name][:n] = getattr(history, name).array
+            self._set_len(n)
+
+    @property
+    def index(self):
+        if self._index is None:
+            index = pd.DatetimeIndex(self._stamps[:self._n].view("M8[ns]"), name="datetime")
+            if self.tz is not None:
+                index = index.tz_localize("UTC").tz_convert(self.tz)
+            self._index = index
+        return self._index
+
+    def __len__(self):
+        return self._n
+
+    def _set_len(self, n):
+        self._n = n
+        self._index = None
+        for name in _COLUMNS:
+            getattr(self, name)._set(self._cols[name][:n])
+
+    def _grow(self):
+        size = 2 * len(self._stamps)
+        stamps = np.empty(size, dtype=np.int64)
+        stamps[:self._n] = self._stamps[:self._n]
+        self._stamps = stamps
+        for name, col in self._cols.items():
+            grown = np.empty(size, dtype=np.float64)
+            grown[:self._n] = col[:self._n]
+            self._cols[name] = grown
+
+    def append(self, dt, bar):
+        """
+        Add the bar at ``dt``; ``bar`` is a close price, an
+        (open, high, low, close[, volume]) tuple or a mapping of those
+        names. Bars must arrive in time order.
+        """
+        stamp = pd.Timestamp(dt)
+        if self.tz is not None:
+            stamp = stamp.tz_localize(self.tz) if stamp.tz is None else stamp
+        value = stamp.as_unit("ns").value
+
+        if self._n and value <= self._stamps[self._n - 1]:
+            raise ValueError(f"bar at {stamp} is not after the last bar of {getattr(self, '_name', None)!r}")
+
+        if isinstance(bar, dict):
+            row = [bar.get(name, np.nan) for name in _COLUMNS]
+            if np.isnan(row[3]):
+                raise KeyError("live bar missing close")
+            for k in range(3):
+                if np.isnan(row[k]):
+                    row[k] = row[3]
+        elif np.ndim(bar) == 0:
+            row = [bar, bar, bar, bar, np.nan]
+        else:
+            row = list(bar) + [np.nan] * (len(_COLUMNS) - len(bar))
+
+        if self._n == len(self._stamps):
+            self._grow()
+
+        i = self._n
+        self._stamps[i] = value
+        for name, v in zip(_COLUMNS, row):
+            self._cols[name][i] = v
+        self._set_len(i + 1)
+
+    def _row_at(self, dt):
+        # fast path: the clock asks about the bar just appended
+        n = self._n
+        if n and pd.Timestamp(dt).value >= self._stamps[n - 1]:
+            return n - 1
+        return int(np.searchsorted(self._stamps[:n], pd.Timestamp(dt).value, side="right")) - 1
@@ -0,0 +1,96 @@
+"""
+Columnar on-disk feed layout, one directory per feed (the layout of
+functions.market_data_cache.MarketDataCache):
+
+  <dir>/datetime.npy   int64 ns since epoch (UTC)
+  <dir>/<column>.npy   float64, one file per OHLCV column
+
+    save_frames(frames, "data_mmap")               # ticker -> frame, once
+    data = MmapData("data_mmap/SPY", start="2012")  # opens instantly
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .pandasdata import PandasData
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def save_columns(df, path):
+    """Write one OHLCV frame (case-insensitive columns, volume optional)."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    cols = {c.lower(): c for c in df.columns}
+    for name in COLUMNS[:4]:
+        if name not in cols:
+            raise KeyError(f"frame missing column: {name}")
+
+    np.save(path / "datetime.npy", pd.DatetimeIndex(df.index).as_unit("ns").asi8)
+    for name in COLUMNS:
+        values = df[cols[name]] if name in cols else np.full(len(df), np.nan)
+        np.save(path / f"{name}.npy", np.asarray(values, dtype=np.float64))
+
+
+def save_frames(frames, root):
+    """Write ``{ticker: frame}`` as ``root/<TICKER>/``; returns ticker -> path."""
+    root = Path(root)
+    paths = {}
+    for ticker, df in frames.items():
+        paths[ticker] = root / ticker.upper()
+        save_columns(df, paths[ticker])
+    return paths
+
+
+def load_columns(path, mmap_mode="r"):
+    """(int64 ns stamps, {column: float64 array}) memory-mapped from ``path``."""
+    path = Path(path)
+    stamps = np.load(path / "datetime.npy", mmap_mode=mmap_mode)
+    columns = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in COLUMNS}
+    return stamps, columns
+
+
+class MmapData(PandasData):
+    """
+    Feed over a columnar directory through ``numpy.memmap``.
+
+    Only the timestamps are read up front (the clock aligns on them); OHLCV
+    values are paged in by the OS as bars and indicators touch them, and
+    every process mapping the same files shares the page cache.
+
+    start / end (inclusive) select a date range without reading the rest;
+    tz restores a timezone-aware index (timestamps are stored as UTC).
+    """
+
+    def __init__(self, path, start=None, end=None, tz=None):
+        self.df = None
+        self.path = Path(path)
+        self.tz = None if tz is None else str(tz)
+
+        stamps, columns = load_columns(self.path)
+
+        lo, hi = 0, len(stamps)
+        if start is not None:
+            lo = int(np.searchsorted(stamps, pd.Timestamp(start).value, side="left"))
+        if end is not None:
+            # whole end day when given a date
+            end = pd.Timestamp(end)
+            if end == end.normalize():
+                end += pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+            hi = int(np.searchsorted(stamps, end.value, side="right"))
+        self.span = (lo, hi)
+
+        index = pd.DatetimeIndex(np.asarray(stamps[lo:hi]).view("M8[ns]"), name="datetime")
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+
+        self._setup(index, {name: values[lo:hi] for name, values in columns.items()})
+
+    @classmethod
+    def from_frame(cls, df, path):
+        """Convert ``df`` to the columnar layout at ``path`` and open it."""
+        save_columns(df, path)
+        tz = getattr(df.index, "tz", None)
+        return cls(path, tz=tz)
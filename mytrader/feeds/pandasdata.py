@@ -1,45 +1,103 @@
+import numpy as np
+
+
 class Line:
-    def __init__(self, data, col):
+    """
+    One OHLCV column served from a contiguous float64 array.
+
+    ``line[0]`` is the current bar, ``line[-k]`` looks back k bars.
+    """
+
+    def __init__(self, data, values):
         self.data = data
-        self.col = col
+        self._set(values)
+
+    def _set(self, values):
+        self._values = values
+        self._view = None  # read-only view, built on first use
+
+    @property
+    def array(self):
+        """Zero-copy, read-only view over the whole column."""
+        view = self._view
+        if view is None:
+            view = self._view = self._values.view()
+            view.flags.writeable = False
+        return view
+
+    def __len__(self):
+        return len(self._values)
 
     def __getitem__(self, idx):
         i = self.data.idx + idx
 
         # before first bar or after last bar → Backtrader returns nan
-        if i < 0 or i >= len(self.data.df):
+        if i < 0 or i >= len(self._values):
             return float("nan")
 
-        return self.data.df.iloc[i][self.col]
+        return self._values[i]
 
 
 class DateTimeLine:
     def __init__(self, data):
         self.data = data
+        self._last_i = None
+        self._last_ts = None
 
-    def date(self, _):
-        return self.data.df.iloc[self.data.idx].name.date()
+    @property
+    def array(self):
+        """The bar timestamps as a ``datetime64`` array."""
+        return self.data.index.values
 
-    def datetime(self, _):
-        i = self.data.idx
+    def _timestamp(self, ago):
+        i = self.data.idx + ago
+        index = self.data.index  # read per call: live feeds grow
 
         # before first bar or after last bar → return None
-        if i < 0 or i >= len(self.data.df):
+        if i < 0 or i >= len(index):
             return None
 
-        ts = self.data.df.iloc[i].name
+        # memoize: date(0) / datetime(0) are read many times per bar
+        if self._last_i != i:
+            ts = index[i]
 
-        # index may already be datetime
+            # index may already be datetime
+            try:
+                ts = ts.to_pydatetime()
+            except AttributeError:
+                pass
+
+            self._last_i = i
+            self._last_ts = ts
+
+        return self._last_ts
+
+    def date(self, ago=0):
+        ts = self._timestamp(ago)
+        if ts is None:
+            return None
         try:
-            return ts.to_pydatetime()
+            return ts.date()
         except AttributeError:
             return ts
 
+    def datetime(self, ago=0):
+        return self._timestamp(ago)
+
 
 class PandasData:
+    """
+    Feed over a static DataFrame.
+
+    OHLC(V) columns are copied once into contiguous float64 arrays so that
+    per-bar reads never touch pandas.
+    """
+
+    # full history is known up front (indicators may precompute)
+    static = True
+
     def __init__(self, dataname):
         self.df = dataname
-        self.idx = -1
 
         # normalize columns (case-insensitive)
         cols = {c.lower(): c for c in self.df.columns}
@@ -50,29 +108,72 @@ class PandasData:
                 raise KeyError(f"PandasData missing column: {name}")
             return cols[key]
 
-        self.open = Line(self, col("open"))
-        self.high = Line(self, col("high"))
-        self.low = Line(self, col("low"))
-        self.close = Line(self, col("close"))
+        def values(name):
+            return np.array(self.df[col(name)], dtype=np.float64)
+
+        columns = {name: values(name) for name in ("open", "high", "low", "close")}
+
+        # volume is optional
+        if "volume" in cols:
+            columns["volume"] = values("volume")
+        else:
+            columns["volume"] = np.full(len(self.df), np.nan)
+
+        self._setup(self.df.index, columns)
+
+    @classmethod
+    def from_arrays(cls, index, open, high, low, close, volume=None):
+        """
+        Build a feed over existing float64 arrays without copying them
+        (e.g. arrays living in shared memory).
+        """
+        self = cls.__new__(cls)
+        self.df = None
+
+        if volume is None:
+            volume = np.full(len(index), np.nan)
+
+        self._setup(index, dict(open=open, high=high, low=low, close=close, volume=volume))
+        return self
+
+    def _setup(self, index, columns):
+        self.index = index
+        self.idx = -1
+
+        self.open = Line(self, columns["open"])
+        self.high = Line(self, columns["high"])
+        self.low = Line(self, columns["low"])
+        self.close = Line(self, columns["close"])
+        self.volume = Line(self, columns["volume"])
 
         self.datetime = DateTimeLine(self)
 
     def __len__(self):
-        return len(self.df)
+        return len(self.index)
 
     def _advance(self, idx: int):
         self.idx = idx
 
     def __getitem__(self, idx):
-        i = self.data.idx + idx
+        # Backtrader: data[0] is the close
+        return self.close[idx]
 
-        # before first bar or after last bar → Backtrader returns nan
-        if i < 0 or i >= len(self.data.df):
-            return float("nan")
+    def _align_to(self, index):
+        """
+        Row of this feed for every timestamp of ``index`` (the master clock).
+
+        Timestamps missing from the feed carry the previous row forward;
+        bars before the feed's first row map to -1.
+        """
+        pos = self.index.get_indexer(index)
+        hit = pos >= 0
+
+        # index (into ``index``) of the last bar that hit a row of this feed
+        last = np.where(hit, np.arange(len(pos)), -1)
+        np.maximum.accumulate(last, out=last)
 
-        return self.data.df.iloc[i][self.col]
+        return np.where(last >= 0, pos[last], -1)
 
-    def _advance_to_date(self, dt):
-        if dt in self.df.index:
-            self.idx = self.df.index.get_loc(dt)
-        # else: keep idx unchanged (carry-forward)
+    def _row_at(self, dt):
+        """Last row at or before timestamp ``dt`` (-1 if none)."""
+        return int(self.index.searchsorted(dt, side="right")) - 1
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from .pandasdata import PandasData
+
+_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class Resampler:
+    """
+    Streaming OHLCV aggregation into fixed time buckets ("1h", "1D", ...).
+
+    Source rows are pushed in time order, in chunks of any size; each chunk
+    is reduced with NumPy and only the bar still being built is carried over
+    to the next push. Completed bars go to growable output columns, so the
+    source is never copied as a whole.
+
+    A bar is labelled with the timestamp of its last source row, i.e. the
+    moment it is complete: aligned to the source clock, it becomes visible
+    on that row and not before (no lookahead).
+    """
+
+    def __init__(self, rule, capacity=1024):
+        self.rule = rule
+        self.step = pd.Timedelta(rule).value
+        if self.step <= 0:
+            raise ValueError(f"resample rule must be a positive duration, got {rule!r}")
+
+        self._n = 0
+        self._stamps = np.empty(capacity, dtype=np.int64)
+        self._cols = {name: np.empty(capacity, dtype=np.float64) for name in _COLUMNS}
+
+        self._bucket = None   # bucket of the bar being built
+        self._partial = None  # its [stamp, open, high, low, close, volume]
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def stamps(self):
+        """Label (ns since epoch) of every completed bar."""
+        return self._stamps[:self._n]
+
+    def column(self, name):
+        return self._cols[name][:self._n]
+
+    def _emit(self, stamps, open, high, low, close, volume):
+        k = len(stamps)
+        if self._n + k > len(self._stamps):
+            size = max(2 * len(self._stamps), self._n + k)
+            grown = np.empty(size, dtype=np.int64)
+            grown[:self._n] = self._stamps[:self._n]
+            self._stamps = grown
+            for name, col in self._cols.items():
+                grown = np.empty(size, dtype=np.float64)
+                grown[:self._n] = col[:self._n]
+                self._cols[name] = grown
+
+        end = self._n + k
+        self._stamps[self._n:end] = stamps
+        for name, values in zip(_COLUMNS, (open, high, low, close, volume)):
+            self._cols[name][self._n:end] = values
+        self._n = end
+
+    def push(self, stamps, open, high, low, close, volume, wall=None):
+        """
+        Aggregate a chunk of source rows. ``stamps`` are the row labels (ns
+        since epoch); ``wall`` the ns used for bucketing (default ``stamps``;
+        pass local wall-clock time so daily buckets follow the exchange day).
+        """
+        if not len(stamps):
+            return
+
+        bucket = (stamps if wall is None else wall) // self.step
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends = np.r_[starts[1:], len(bucket)] - 1
+
+        bars = [
+            stamps[ends],
+            open[starts],
+            np.maximum.reduceat(high, starts),
+            np.minimum.reduceat(low, starts),
+            close[ends],
+            np.add.reduceat(volume, starts),
+        ]
+
+        # the first group continues the bar carried over from the last push
+        if self._partial is not None:
+            if bucket[0] == self._bucket:
+                p = self._partial
+                bars[1][0] = p[1]
+                bars[2][0] = max(bars[2][0], p[2])
+                bars[3][0] = min(bars[3][0], p[3])
+                bars[5][0] += p[5]
+            else:
+                self._emit(*([v] for v in self._partial))
+
+        # every group but the last is complete
+        self._emit(*(v[:-1] for v in bars))
+        self._bucket = bucket[-1]
+        self._partial = [v[-1] for v in bars]
+
+    def flush(self):
+        """Complete the bar being built (end of the source)."""
+        if self._partial is not None:
+            self._emit(*([v] for v in self._partial))
+            self._bucket = self._partial = None
+
+
+class ResampledData(PandasData):
+    """
+    Feed of ``source`` resampled to ``rule`` (e.g. daily bars from minutes).
+
+    Built by streaming the source columns through a Resampler ``chunk`` rows
+    at a time; only the (much shorter) resampled columns are allocated.
+    Indicators bind to it like to any feed, and Cerebro aligns it to the
+    master clock: with a minute master, a daily bar is read from the last
+    minute of its day on.
+    """
+
+    def __init__(self, source, rule="1D", chunk=1 << 16):
+        self.df = None
+        self.source = source
+        self.rule = rule
+
+        index = source.index
+        stamps = index.as_unit("ns").asi8
+        tz = getattr(index, "tz", None)
+        lines = [getattr(source, name).array for name in _COLUMNS]
+
+        rs = Resampler(rule)
+        for a in range(0, len(index), chunk):
+            b = a + chunk
+            # bucket on local wall-clock time (one chunk converted at a time)
+            wall = index[a:b].tz_localize(None).as_unit("ns").asi8 if tz is not None else None
+            rs.push(stamps[a:b], *(values[a:b] for values in lines), wall=wall)
+        rs.flush()
+
+        resampled = pd.DatetimeIndex(rs.stamps.view("datetime64[ns]"))
+        if tz is not None:
+            resampled = resampled.tz_localize("UTC").tz_convert(tz)
+
+        self._setup(resampled, {name: rs.column(name) for name in _COLUMNS})
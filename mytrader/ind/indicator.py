@@ -1,13 +1,195 @@
+import inspect
+from time import perf_counter
+
+import numpy as np
+
 from mytrader.context import get_current_strategy
 
 
-class Indicator:
+class IndicatorRegistry:
+    """
+    Indicators shared by the strategies of one Cerebro run, keyed by
+    (feed, type, params): a strategy that builds an indicator another one
+    already built gets the same instance, so its values are computed once.
+    """
+
+    def __init__(self):
+        self._instances = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._instances)
+
+    @staticmethod
+    def key(cls, data, args, kwargs):
+        """(feed, type, params) with defaults filled in; None if unhashable."""
+        bound = inspect.signature(cls.__init__).bind(None, data, *args, **kwargs)
+        bound.apply_defaults()
+        params = tuple(bound.arguments.items())[2:]  # minus self and data
+
+        key = (data, cls, params)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key):
+        ind = self._instances.get(key)
+        if ind is not None:
+            self.hits += 1
+        return ind
+
+    def add(self, key, ind):
+        self._instances[key] = ind
+
+
+def _register(strategy, ind):
+    if not hasattr(strategy, "_indicators"):
+        strategy._indicators = []
+    if ind not in strategy._indicators:
+        strategy._indicators.append(ind)
+
+
+class _SharedIndicator(type):
+    """Builds indicators through the running Cerebro's IndicatorRegistry."""
+
+    def __call__(cls, data, *args, **kwargs):
+        strategy = get_current_strategy()
+        registry = getattr(getattr(strategy, "cerebro", None), "indicators", None)
+        if registry is None:
+            return super().__call__(data, *args, **kwargs)
+
+        key = registry.key(cls, data, args, kwargs)
+        ind = registry.get(key) if key is not None else None
+        if ind is None:
+            ind = super().__call__(data, *args, **kwargs)
+            if key is not None:
+                registry.add(key, ind)
+        else:
+            _register(strategy, ind)
+        return ind
+
+
+class Indicator(metaclass=_SharedIndicator):
+    """
+    Base indicator: one output value per row of ``data``.
+
+    Two ways of producing the values:
+
+      once()  -> whole history in one vectorized pass (precompute mode)
+      next(i) -> value for row i, rows visited in order (streaming mode)
+
+    Precompute mode is opt-in per indicator class (``precompute = True``)
+    and only used when the feed is static, i.e. the full history is known
+    up front. Otherwise values are streamed as the clock reaches them.
+
+    Built inside a strategy run by Cerebro, identical indicators (same
+    feed, type and params) are shared between strategies.
+
+    ``state_attrs`` names the attributes next() carries from row to row;
+    getstate() / setstate() save and restore them with the latest values
+    for Cerebro checkpoints.
+    """
+
+    precompute = False
+    state_attrs = ()
+
+    # values came from once(): the streaming state was never built
+    _precomputed = False
+
+    # BarProfiler, set by Cerebro.run(profile=True)
+    _profiler = None
+
     def __init__(self, data):
         self.data = data
+        self._values = None
 
         # 🔑 auto-register using construction context
         strategy = get_current_strategy()
         if strategy is not None:
-            if not hasattr(strategy, "_indicators"):
-                strategy._indicators = []
-            strategy._indicators.append(self)
+            _register(strategy, self)
+
+    def _start(self):
+        """Called once after the strategy is built (or on first access)."""
+        if self._values is not None:
+            return
+
+        if self._profiler is not None:
+            t0 = perf_counter()
+
+        if self.precompute and getattr(self.data, "static", False):
+            self._values = self.once().tolist()
+            self._precomputed = True
+        else:
+            self._values = []
+
+        if self._profiler is not None:
+            self._profiler.add(f"{self._label()} once", t0, perf_counter())
+
+    def once(self):
+        raise NotImplementedError
+
+    def next(self, i):
+        raise NotImplementedError
+
+    def _extend(self, i):
+        if self._profiler is not None:
+            t0 = perf_counter()
+
+        # stream the rows not computed yet, up to (and including) row i
+        for j in range(len(self._values), min(i + 1, len(self.data))):
+            self._values.append(self.next(j))
+
+        if self._profiler is not None:
+            self._profiler.add(f"{self._label()} next", t0, perf_counter())
+
+    def getstate(self, keep):
+        """The last ``keep`` values and the streaming state at the feed's last row."""
+        self._start()
+        if self._precomputed and self.state_attrs:
+            # replay next() once so the state matches what streaming builds
+            for j in range(len(self.data)):
+                self.next(j)
+            self._precomputed = False
+        else:
+            self._extend(len(self.data) - 1)
+
+        return dict(
+            values=self._values[max(0, len(self._values) - keep):],
+            state={name: getattr(self, name) for name in self.state_attrs},
+        )
+
+    def setstate(self, state):
+        """Continue from getstate() output; the feed holds the same last rows."""
+        self._values = list(state["values"])
+        for name, value in state["state"].items():
+            setattr(self, name, value)
+
+    def _label(self):
+        period = getattr(self, "period", None)
+        args = getattr(self.data, "_name", None) or "?"
+        if period is not None:
+            args = f"{args}, {period}"
+        return f"indicator:{type(self).__name__}({args})"
+
+    @property
+    def array(self):
+        """Full series as a float64 array, one value per feed row."""
+        self._start()
+        self._extend(len(self.data) - 1)
+        return np.asarray(self._values, dtype=float)
+
+    def __getitem__(self, idx):
+        i = self.data.idx + idx
+        if i < 0:
+            return float("nan")
+
+        if self._values is None:
+            self._start()
+        if i >= len(self._values):
+            self._extend(i)
+            if i >= len(self._values):
+                return float("nan")
+
+        return self._values[i]
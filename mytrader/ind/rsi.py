@@ -1,3 +1,7 @@
+import copy
+
+import numpy as np
+
 from mytrader.ind.indicator import Indicator
 
 
@@ -42,8 +46,14 @@ class RSI(Indicator):
     This is a faithful, line-for-line semantic port of:
 
         backtrader.indicators.rsi.RelativeStrengthIndex
+
+    Every computed value is kept (one per feed row), so any lookback
+    ``rsi[-k]`` is a plain lookup and reads never disturb the SMMA state.
     """
 
+    precompute = True
+    state_attrs = ("_up_smma", "_down_smma")
+
     def __init__(self, data, period=14, lookback=1):
         super().__init__(data)
 
@@ -54,23 +64,67 @@ class RSI(Indicator):
         self._up_smma = _SMMA(period)
         self._down_smma = _SMMA(period)
 
-        self._last_i = None
-        self._last_rsi = float("nan")
+    def once(self):
+        close = self.data.close.array
+        n = len(close)
+        period, lookback = self.period, self.lookback
+        out = np.full(n, np.nan)
+
+        # first row with a fully seeded SMMA
+        first = lookback + period - 1
+        if n <= first:
+            return out
 
-    def __getitem__(self, idx):
-        i = self.data.idx + idx
+        # -------- UpDay / DownDay (EXACT)
+        ups = np.maximum(close[lookback:] - close[:-lookback], 0.0).tolist()
+        downs = np.maximum(close[:-lookback] - close[lookback:], 0.0).tolist()
+
+        # -------- Wilder SMMA (sequential by nature, one pass)
+        avg_up = [0.0] * (n - first)
+        avg_down = [0.0] * (n - first)
+        au = sum(ups[:period]) / period
+        ad = sum(downs[:period]) / period
+        avg_up[0], avg_down[0] = au, ad
+
+        for k in range(period, len(ups)):
+            au = ((au * (period - 1)) + ups[k]) / period
+            ad = ((ad * (period - 1)) + downs[k]) / period
+            avg_up[k - period + 1] = au
+            avg_down[k - period + 1] = ad
 
+        # -------- RSI calculation (EXACT)
+        avg_up = np.asarray(avg_up)
+        avg_down = np.asarray(avg_down)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - (100.0 / (1.0 + avg_up / avg_down))
+        rsi[avg_down == 0.0] = 100.0
+
+        out[first:] = rsi
+        return out
+
+    def getstate(self, keep):
+        state = super().getstate(keep)
+        # row numbers don't survive a resume (see setstate): leave them out
+        for name, smma in state["state"].items():
+            smma = state["state"][name] = copy.copy(smma)
+            smma._last_i = None
+        return state
+
+    def setstate(self, state):
+        super().setstate(state)
+        # rows are renumbered on resume: the restored state is the last row's
+        last = len(self._values) - 1
+        self._up_smma._last_i = self._down_smma._last_i = last
+
+    def next(self, i):
         # need previous bar
         if i < self.lookback:
             return float("nan")
 
-        # already calculated this bar
-        if self._last_i == i:
-            return self._last_rsi
-
         # -------- UpDay / DownDay (EXACT)
-        prev = self.data.close[-self.lookback]
-        curr = self.data.close[0]
+        close = self.data.close.array
+        prev = close[i - self.lookback]
+        curr = close[i]
 
         up = max(curr - prev, 0.0)
         down = max(prev - curr, 0.0)
@@ -79,19 +133,13 @@ class RSI(Indicator):
         avg_up = self._up_smma.update(up, i)
         avg_down = self._down_smma.update(down, i)
 
-        # still seeding (should not happen after warmup)
+        # still seeding
         if avg_up is None or avg_down is None:
-            self._last_i = i
-            self._last_rsi = float("nan")
-            return self._last_rsi
+            return float("nan")
 
         # -------- RSI calculation (EXACT)
         if avg_down == 0.0:
-            rsi = 100.0
-        else:
-            rs = avg_up / avg_down
-            rsi = 100.0 - (100.0 / (1.0 + rs))
+            return 100.0
 
-        self._last_i = i
-        self._last_rsi = rsi
-        return rsi
+        rs = avg_up / avg_down
+        return 100.0 - (100.0 / (1.0 + rs))
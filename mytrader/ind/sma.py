@@ -1,19 +1,36 @@
+import numpy as np
+
 from mytrader.ind.indicator import Indicator
 
 
 class SMA(Indicator):
+    precompute = True
+
     def __init__(self, data, period):
         super().__init__(data)
         self.data = data
         self.period = period
 
-    def __getitem__(self, idx):
-        i = self.data.idx + idx
+    def once(self):
+        close = self.data.close.array
+        n = len(close)
+        out = np.full(n, np.nan)
+
+        m = n - self.period + 1
+        if m > 0:
+            # window sums added term by term across all windows at once:
+            # same association order as sum(window), so results are bit-exact
+            acc = np.zeros(m)
+            for k in range(self.period):
+                acc += close[k:k + m]
+            out[self.period - 1:] = acc / self.period
+
+        return out
+
+    def next(self, i):
         if i < self.period - 1:
             return float("nan")
 
-        values = [
-            self.data.close[j - i]
-            for j in range(i - self.period + 1, i + 1)
-        ]
-        return float(sum(values) / self.period)
+        # sum(window) adds in once()'s order: streamed values are bit-exact
+        window = self.data.close.array[i - self.period + 1:i + 1].tolist()
+        return sum(window) / self.period
@@ -0,0 +1,181 @@
+"""
+Fill journal kept by the Broker: one row per executed order, stored as
+NumPy columns that grow by doubling.
+
+    ledger = cerebro.broker.ledger
+    ledger.to_frame()               # dt | data | side | size | price | cash
+    ledger.pnl_by_data(marks)       # realized + open PnL per data
+    ledger.holding_periods()        # entry / exit per round trip
+    ledger.export("fills.parquet")  # or .csv; to_arrow() for a pyarrow Table
+"""
+import numpy as np
+import pandas as pd
+
+from .order import Order
+
+
+class FillLedger:
+    _COLUMNS = (
+        ("dt", "datetime64[ns]"),
+        ("data", np.int32),  # index into self.names
+        ("side", np.int8),  # Order.BUY / Order.SELL
+        ("size", np.float64),  # signed: negative for sells
+        ("price", np.float64),
+        ("cash", np.float64),  # broker cash after the fill
+    )
+
+    def __init__(self, capacity=64):
+        self.names = []
+        self._ids = {}
+        self._n = 0
+        self._cols = {name: np.empty(capacity, dtype=dtype) for name, dtype in self._COLUMNS}
+
+    def __len__(self):
+        return self._n
+
+    def _data_id(self, data):
+        i = self._ids.get(data)
+        if i is None:
+            i = self._ids[data] = len(self.names)
+            self.names.append(getattr(data, "_name", None) or f"data{i}")
+        return i
+
+    def append(self, dt, data, side, size, price, cash):
+        if self._n == len(self._cols["dt"]):
+            for name, col in self._cols.items():
+                grown = np.empty(2 * len(col), dtype=col.dtype)
+                grown[:self._n] = col[:self._n]
+                self._cols[name] = grown
+
+        i = self._n
+        c = self._cols
+        c["dt"][i] = dt
+        c["data"][i] = self._data_id(data)
+        c["side"][i] = side
+        c["size"][i] = size
+        c["price"][i] = price
+        c["cash"][i] = cash
+        self._n += 1
+
+    def getstate(self):
+        """Names and filled columns (for checkpoints)."""
+        return dict(names=list(self.names), cols={name: self.column(name).copy() for name in self._cols})
+
+    def setstate(self, state, datasbyname):
+        """Restore getstate() output; fills are re-linked to the datas by name."""
+        self.names = list(state["names"])
+        self._ids = {datasbyname[name]: i for i, name in enumerate(self.names)}
+        self._n = len(state["cols"]["dt"])
+        capacity = max(64, 2 * self._n)
+        for name, col in state["cols"].items():
+            self._cols[name] = np.empty(capacity, dtype=col.dtype)
+            self._cols[name][:self._n] = col
+
+    def column(self, name):
+        """Read-only view of one column over the recorded fills."""
+        view = self._cols[name][:self._n].view()
+        view.flags.writeable = False
+        return view
+
+    # =========================
+    # Export
+    # =========================
+    def to_frame(self):
+        side = self.column("side")
+        return pd.DataFrame({
+            "dt": self.column("dt"),
+            "data": pd.Categorical.from_codes(self.column("data"), categories=self.names)
+            if self.names else pd.Categorical([]),
+            "side": np.where(side == Order.BUY, "BUY", "SELL"),
+            "size": self.column("size"),
+            "price": self.column("price"),
+            "cash": self.column("cash"),
+        })
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(self.to_frame(), preserve_index=False)
+
+    def export(self, path):
+        """Write the fills to a .parquet or .csv file."""
+        path = str(path)
+        df = self.to_frame()
+        if path.endswith(".parquet"):
+            df.to_parquet(path, index=False)
+        elif path.endswith(".csv"):
+            df.to_csv(path, index=False)
+        else:
+            raise ValueError(f"unsupported export format for {path!r} (use .parquet or .csv)")
+
+    # =========================
+    # Analytics
+    # =========================
+    def traded_value(self):
+        """Gross traded value (sum of |size * price|) per data name."""
+        flow = np.abs(self.column("size") * self.column("price"))
+        totals = np.bincount(self.column("data"), weights=flow, minlength=len(self.names))
+        return pd.Series(totals, index=self.names, name="traded_value")
+
+    def turnover(self, equity):
+        """Total traded value over the mean of ``equity`` (a value or an array)."""
+        return float(self.traded_value().sum() / np.mean(equity))
+
+    def pnl_by_data(self, marks=None):
+        """
+        PnL per data name: cash flows of all fills plus any open size
+        valued at ``marks`` (name -> price; open positions count 0 without).
+        """
+        data = self.column("data")
+        size = self.column("size")
+        n = len(self.names)
+
+        flows = np.bincount(data, weights=-size * self.column("price"), minlength=n)
+        open_size = np.bincount(data, weights=size, minlength=n)
+
+        if marks:
+            prices = np.array([marks.get(name, 0.0) for name in self.names], dtype=np.float64)
+            flows = flows + open_size * prices
+
+        return pd.DataFrame({"pnl": flows, "open_size": open_size}, index=self.names)
+
+    def holding_periods(self, tol=1e-9):
+        """
+        One row per round trip (flat -> position -> flat) per data, with
+        entry / exit timestamps and duration. Open positions have a NaT exit.
+        """
+        if not self._n:
+            return pd.DataFrame(columns=["data", "entry", "exit", "duration"])
+
+        data = self.column("data")
+        size = self.column("size")
+        dt = self.column("dt")
+
+        # group fills by data, keeping time order inside each group
+        order = np.argsort(data, kind="stable")
+        data, size, dt = data[order], size[order], dt[order]
+
+        pos = np.cumsum(size)
+        first = np.r_[True, data[1:] != data[:-1]]
+        pos -= np.repeat(np.r_[0.0, pos[:-1]][first], np.diff(np.r_[np.flatnonzero(first), len(data)]))
+
+        flat = np.abs(pos) < tol
+        was_flat = np.r_[True, flat[:-1]]
+        was_flat[first] = True
+
+        entries = np.flatnonzero(was_flat & ~flat)
+        exits = np.flatnonzero(flat & ~was_flat)
+
+        # each exit closes the latest entry of the same data before it
+        exit_dt = np.full(len(entries), np.datetime64("NaT"), dtype="datetime64[ns]")
+        k = np.searchsorted(entries, exits) - 1
+        exit_dt[k] = dt[exits]
+
+        names = np.array(self.names, dtype=object)
+        df = pd.DataFrame({
+            "data": names[data[entries]] if len(entries) else np.array([], dtype=object),
+            "entry": dt[entries],
+            "exit": exit_dt,
+        })
+        df["duration"] = df["exit"] - df["entry"]
+        return df
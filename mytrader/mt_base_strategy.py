@@ -1,4 +1,9 @@
+import numpy as np
+import pandas as pd
+
 import mytrader as bt
+from mytrader.analyzers.analyzer import drawdowns
+from mytrader.tradelog import DEBUG, INFO, TradeLogger
 
 
 class MTBaseStrategy(bt.Strategy):
@@ -6,6 +11,12 @@ class MTBaseStrategy(bt.Strategy):
         trade_start=None,  # 👈 global gate (date or None)
     )
 
+    # carried over by Cerebro checkpoints
+    checkpoint_attrs = (
+        "peak_value", "max_dd_pct", "max_dd_date", "max_dd_value",
+        "min_portfolio_value", "_trading_enabled",
+    )
+
     def __init__(self):
         # --- drawdown state (HARD RESET PER RUN) ---
         v = self.broker.getvalue()
@@ -14,42 +25,63 @@ class MTBaseStrategy(bt.Strategy):
         self.max_dd_date = None
         self.max_dd_value = v
         self.min_portfolio_value = v
+        self._dd_bar = 0  # first bar of the equity curve not yet counted
 
         # --- trading gate ---
         self._trading_enabled = False
 
-    def _evaluate_indicators(self):
-        for ind in getattr(self, "_indicators", []):
-            try:
-                _ = ind[0]
-            except Exception:
-                pass
+    # =========================
+    # Per-bar values
+    # =========================
+    @bt.perbar
+    def today(self):
+        return self.datas[0].datetime.date(0)
+
+    @bt.perbar
+    def portfolio_value(self):
+        # fills only happen between bars, so this holds for the whole bar
+        return self.broker.getvalue()
 
     # =========================
-    # Max Drawdown Tracker
+    # Max Drawdown (from the recorded equity curve)
     # =========================
-    def _update_drawdown(self):
-        # ❌ DO NOT TRACK DD BEFORE TRADING STARTS
-        if not self.trading_allowed():
-            return
+    def stop(self):
+        self._compute_drawdown()
 
-        current_value = self.broker.getvalue()
-        dt = self.datas[0].datetime.date(0)
+    def _after_bar(self):
+        # streamed bars: keep the figures current between push() calls
+        self._compute_drawdown()
 
-        # Update peak
-        if current_value > self.peak_value:
-            self.peak_value = current_value
-            return
+    def setstate(self, state):
+        super().setstate(state)
+        # the restored bars are already in the drawdown figures
+        self._dd_bar = self._equity_len
 
-        # Compute drawdown
-        dd_pct = (self.peak_value - current_value) / self.peak_value * 100.0
+    def _compute_drawdown(self):
+        # only the bars since the last call (a resumed run continues)
+        equity = self.equity[self._dd_bar:self._equity_len]
+        dates = self.data.index[self._dd_bar:self._equity_len]
+        self._dd_bar = self._equity_len
 
-        if dd_pct > self.max_dd_pct:
-            self.max_dd_pct = dd_pct
-            self.max_dd_date = dt
-            self.max_dd_value = current_value
+        # ❌ DO NOT TRACK DD BEFORE TRADING STARTS
+        if self.p.trade_start is not None:
+            # on dates, like trading_allowed(): the index may be tz-aware
+            keep = dates.date >= pd.Timestamp(self.p.trade_start).date()
+            equity = equity[keep]
+            dates = dates[keep]
 
-        self.min_portfolio_value = min(self.min_portfolio_value, self.broker.getvalue())
+        if not len(equity):
+            return
+
+        peak, dd, _ = drawdowns(equity, self.peak_value)
+        self.peak_value = float(peak[-1])
+        self.min_portfolio_value = min(self.min_portfolio_value, float(equity.min()))
+
+        k = int(np.argmax(dd))  # first bar of the deepest drawdown
+        if dd[k] > self.max_dd_pct:
+            self.max_dd_pct = float(dd[k])
+            self.max_dd_date = dates[k].date()
+            self.max_dd_value = float(equity[k])
 
     # =========================
     # Trading gate
@@ -62,7 +94,7 @@ class MTBaseStrategy(bt.Strategy):
         if self.p.trade_start is None:
             return True
 
-        today = self.datas[0].datetime.date(0)
+        today = self.today
 
         if today < self.p.trade_start:
             return False
@@ -73,16 +105,31 @@ class MTBaseStrategy(bt.Strategy):
 
         return True
 
-    def log(self, txt, dt=None):
-        if not hasattr(self, "log_lines"):
-            self.log_lines = []
+    def log(self, txt, dt=None, level=INFO):
+        """
+        txt may be a callable returning the message: it is only called
+        (and the line only formatted) when ``level`` is enabled.
+        """
+        if self.logger is None:
+            self.logger = TradeLogger()
+
+        if not self.logger.enabled(level):
+            return
+
+        dt = dt or self.today
+        self.logger.log(txt, dt, level)
+
+    def debug(self, txt, dt=None):
+        self.log(txt, dt, level=DEBUG)
 
-        dt = dt or self.datas[0].datetime.date(0)
-        formatted_dt = dt.strftime("%Y-%m-%d")
-        line = f"{formatted_dt}, {txt}"
+    def log_enabled(self, level=INFO) -> bool:
+        return self.logger is None or self.logger.enabled(level)
 
-        self.log_lines.append(line)
-        print(line)
+    @property
+    def log_lines(self):
+        if self.logger is None:
+            self.logger = TradeLogger()
+        return self.logger.lines
 
     def _format_ohlc(self, data):
         try:
@@ -99,6 +146,10 @@ class MTBaseStrategy(bt.Strategy):
     # Order logging only
     # =========================
     def notify_order(self, order):
+        # nothing below but logging
+        if not self.log_enabled(INFO):
+            return
+
         if order.status in [order.Canceled, order.Margin, order.Rejected]:
             self.log(
                 "\n".join([
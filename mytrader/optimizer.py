@@ -0,0 +1,222 @@
+"""
+Parameter sweeps: one strategy class, a grid of params, a process pool.
+
+Market data is published once in shared memory; every worker maps the same
+pages back into feeds (PandasData.from_arrays) instead of receiving a pickled
+copy of the frames per task. MmapData feeds are already file-backed: workers
+map the same files and share the OS page cache.
+"""
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from . import fastpath
+from .analyzers import DrawDown
+from .feeds import MmapData, PandasData
+from .tradelog import SILENT
+
+_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# worker-side state, set once per process by _init_worker
+_worker = {}
+
+
+def _as_axis(value):
+    # Backtrader semantics: a scalar (or a string) is a one-value axis
+    if isinstance(value, (str, bytes)) or not hasattr(value, "__iter__"):
+        return [value]
+    return list(value)
+
+
+def param_grid(**params):
+    """Cartesian product of the param axes, as a list of dicts."""
+    keys = list(params)
+    axes = [_as_axis(params[k]) for k in keys]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*axes)]
+
+
+class SharedFeeds:
+    """
+    Feed arrays published in shared memory, one segment per feed:
+
+      int64[n]      timestamps (ns since epoch, UTC)
+      float64[5, n] open, high, low, close, volume
+
+    MmapData feeds get no segment: their spec entry holds the feed's
+    directory and row span instead.
+    """
+
+    def __init__(self, datas):
+        self.segments = []
+        self.spec = []
+
+        for d in datas:
+            if isinstance(d, MmapData):
+                self.spec.append((d._name, None, (str(d.path), d.span), d.tz, None))
+                continue
+
+            n = len(d)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, n * 8 * (1 + len(_COLUMNS))))
+            self.segments.append(shm)
+
+            stamps, block = _views(shm, n)
+            index = d.index
+            stamps[:] = index.as_unit("ns").asi8
+            for row, name in enumerate(_COLUMNS):
+                block[row] = getattr(d, name).array
+
+            tz = None if index.tz is None else str(index.tz)
+            self.spec.append((d._name, shm.name, n, tz, index.name))
+
+    @staticmethod
+    def attach(spec):
+        """Map the segments described by ``spec``; returns (segments, arrays)."""
+        segments, arrays = [], []
+
+        for name, shm_name, n, tz, index_name in spec:
+            if shm_name is None:
+                path, (lo, hi) = n
+                data = MmapData(path, tz=tz)
+                block = [getattr(data, c).array[lo:hi] for c in _COLUMNS]
+                arrays.append((name, data.index[lo:hi], block))
+                continue
+
+            # workers share the publisher's resource tracker, so the segment
+            # is unlinked exactly once, by SharedFeeds.close()
+            shm = shared_memory.SharedMemory(name=shm_name)
+            segments.append(shm)
+
+            stamps, block = _views(shm, n)
+            index = pd.DatetimeIndex(stamps.view("M8[ns]"), name=index_name)
+            if tz is not None:
+                index = index.tz_localize("UTC").tz_convert(tz)
+
+            arrays.append((name, index, block))
+
+        return segments, arrays
+
+    def close(self):
+        for shm in self.segments:
+            shm.close()
+            shm.unlink()
+        self.segments = []
+
+
+def _views(shm, n):
+    stamps = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+    block = np.ndarray((len(_COLUMNS), n), dtype=np.float64, buffer=shm.buf, offset=n * 8)
+    return stamps, block
+
+
+def _init_worker(spec, stratcls, cash, analyzers, fast=False):
+    segments, arrays = SharedFeeds.attach(spec)
+    _worker.update(
+        segments=segments,
+        arrays=arrays,
+        stratcls=stratcls,
+        cash=cash,
+        analyzers=analyzers,
+        fast=fast,
+    )
+
+
+def _run_one(params):
+    from .cerebro import Cerebro
+
+    # nobody reads strategy logs in a sweep: don't even format them
+    cerebro = Cerebro(cash=_worker["cash"], loglevel=SILENT)
+    for name, index, block in _worker["arrays"]:
+        data = PandasData.from_arrays(index, *block)
+        cerebro.adddata(data, name=name)
+
+    for name, cls, kwargs in _worker["analyzers"]:
+        cerebro.addanalyzer(cls, _name=name, **kwargs)
+    cerebro.addanalyzer(DrawDown, _name="_sweep_dd")
+
+    cerebro.addstrategy(_worker["stratcls"], **params)
+
+    if _worker["fast"]:
+        res = fastpath.backtest(cerebro)
+        cash = _worker["cash"]
+        return dict(
+            final_value=res.final_value,
+            gain_pct=(res.final_value - cash) / cash * 100,
+            car_pct=res.car_pct,
+            max_dd_pct=res.max_dd_pct,
+        )
+
+    strat = cerebro.run()[0]
+
+    cash = _worker["cash"]
+    final_value = cerebro.broker.getvalue()
+    max_dd_pct = strat.analyzers.getbyname("_sweep_dd").get_analysis().max.drawdown
+
+    # CAR from the trading start (or first bar) to the last bar
+    dates = cerebro.datas[0].index
+    start = params.get("trade_start") or dates[0].date()
+    years = (dates[-1].date() - start).days / 365.25
+    car_pct = ((final_value / cash) ** (1 / years) - 1) * 100 if years > 0 else float("nan")
+
+    return dict(
+        final_value=final_value,
+        gain_pct=(final_value - cash) / cash * 100,
+        car_pct=car_pct,
+        max_dd_pct=max_dd_pct,
+    )
+
+
+def run_sweep(cerebro, stratcls, params, maxcpus=None, fast=False):
+    """
+    Run ``stratcls`` once per combination of ``params`` over the data of
+    ``cerebro`` and return one row per combination (params + results).
+
+    fast=True evaluates each combination with mytrader.fastpath (single
+    asset switching strategies only) instead of the bar loop, after
+    checking it against Cerebro.run on the first combination.
+    """
+    grid = param_grid(**params)
+    cash = cerebro.broker.getcash()
+
+    if fast and grid:
+        _check_fast(cerebro, stratcls, grid[0], cash)
+    shared = SharedFeeds(cerebro.datas)
+
+    try:
+        initargs = (shared.spec, stratcls, cash, cerebro._analyzers, fast)
+
+        if maxcpus == 1:
+            _init_worker(*initargs)
+            results = [_run_one(p) for p in grid]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=maxcpus,
+                initializer=_init_worker,
+                initargs=initargs,
+            ) as pool:
+                results = list(pool.map(_run_one, grid))
+    finally:
+        _worker.clear()
+        shared.close()
+
+    rows = [p | r for p, r in zip(grid, results)]
+    return pd.DataFrame(rows)
+
+
+def _check_fast(cerebro, stratcls, params, cash):
+    """Raise if fastpath and Cerebro.run disagree on ``params``."""
+    from .cerebro import Cerebro
+
+    probe = Cerebro(cash=cash, loglevel=SILENT)
+    for data in cerebro.datas:
+        probe.adddata(data, name=data._name)
+    probe.addstrategy(stratcls, **params)
+
+    ok, fast, event = fastpath.check_parity(probe)
+    if not ok:
+        n = min(len(event), len(fast.equity))
+        diff = np.flatnonzero(event[:n] != fast.equity[:n])
+        where = f"bar {diff[0]}" if len(diff) else f"length {len(fast.equity)} != {len(event)}"
+        raise RuntimeError(f"fastpath diverges from Cerebro.run for {params} ({where}): use fast=False")
@@ -1,4 +1,24 @@
+class CreatedInfo:
+    __slots__ = ("price", "size", "target_pct")
+
+    def __init__(self, price, size=None, target_pct=None):
+        self.price = price
+        self.size = size
+        self.target_pct = target_pct
+
+
+class ExecutedInfo:
+    __slots__ = ("size", "price", "dt")
+
+    def __init__(self):
+        self.size = 0.0
+        self.price = 0.0
+        self.dt = None
+
+
 class Order:
+    __slots__ = ("data", "strategy", "side", "created", "status", "executed")
+
     BUY, SELL = range(2)
 
     Created, Submitted, Accepted, Completed, Canceled, Margin, Rejected = range(7)
@@ -13,26 +33,20 @@ class Order:
         self.strategy = strategy
         self.side = side
 
-        self.created = type("Created", (), {})()
-        self.created.price = price
-
         # SELL = exact size
         if side == Order.SELL:
-            self.created.size = size  # negative number
+            self.created = CreatedInfo(price, size=size)  # negative number
 
         # BUY = intent
         elif side == Order.BUY:
-            self.created.target_pct = target_pct
+            self.created = CreatedInfo(price, target_pct=target_pct)
 
         else:
             raise ValueError("Invalid order side")
 
         self.status = Order.Submitted
 
-        self.executed = type("Executed", (), {})()
-        self.executed.size = 0.0
-        self.executed.price = 0.0
-        self.executed.dt = None
+        self.executed = ExecutedInfo()
 
     def isbuy(self):
         return self.executed.size > 0
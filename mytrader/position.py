@@ -1,5 +1,21 @@
 class Position:
-    def __init__(self):
-        self.size = 0.0
+    __slots__ = ("_size", "_broker", "_data")
+
+    def __init__(self, broker=None, data=None):
+        self._size = 0.0
+        # size writes go through the broker's size vector (see Broker)
+        self._broker = broker
+        self._data = data
+
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, size):
+        self._size = size
+        if self._broker is not None:
+            self._broker._sized(self._data, size)
+
     def __bool__(self):
-        return self.size != 0
+        return self._size != 0
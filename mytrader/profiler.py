@@ -0,0 +1,108 @@
+"""
+Bar-loop instrumentation for Cerebro.run(profile=True).
+
+Records, per master bar, the time spent in each engine phase, plus
+cumulative time for named sections (indicators, analyzers, and anything a
+strategy wraps in ``self.section(name)``). Disabled runs record nothing:
+the bar loop calls a dummy clock (returns 0.0) at each phase boundary
+instead of perf_counter, and indicators and sections only check for a
+profiler.
+"""
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+import numpy as np
+
+
+class BarProfiler:
+    PHASES = ("advance", "broker", "next", "analyzers")
+
+    def __init__(self, nbars):
+        self.nbars = nbars
+        self.origin = perf_counter()
+
+        # per bar, per phase: start offset and duration (seconds)
+        self.starts = np.zeros((nbars, len(self.PHASES)))
+        self.durations = np.zeros((nbars, len(self.PHASES)))
+
+        # named sections: cumulative time, call count and trace events
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.events = []
+
+        self.elapsed = 0.0
+
+    def record(self, bar, phase, start, end):
+        self.starts[bar, phase] = start - self.origin
+        self.durations[bar, phase] = end - start
+
+    def add(self, name, start, end):
+        self.totals[name] += end - start
+        self.counts[name] += 1
+        self.events.append((name, start - self.origin, end - start))
+
+    @contextmanager
+    def section(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, perf_counter())
+
+    def stop(self):
+        self.elapsed = perf_counter() - self.origin
+
+    # =========================
+    # Output
+    # =========================
+    def summary(self) -> str:
+        """Plain-text table: phases first, then sections by total time."""
+        total = self.elapsed or float(self.durations.sum()) or 1.0
+        lines = [
+            f"{'phase / section':<40} {'total s':>10} {'% run':>7} {'calls':>9} {'mean us':>10} {'max us':>10}",
+        ]
+
+        for k, phase in enumerate(self.PHASES):
+            d = self.durations[:, k]
+            lines.append(
+                f"{phase:<40} {d.sum():>10.4f} {d.sum() / total * 100:>6.1f}% {len(d):>9} "
+                f"{(d.mean() if len(d) else 0) * 1e6:>10.1f} {(d.max() if len(d) else 0) * 1e6:>10.1f}"
+            )
+
+        for name, t in sorted(self.totals.items(), key=lambda kv: -kv[1]):
+            n = self.counts[name]
+            lines.append(
+                f"{name:<40} {t:>10.4f} {t / total * 100:>6.1f}% {n:>9} {t / n * 1e6:>10.1f} {'':>10}"
+            )
+
+        lines.append(f"{'run':<40} {total:>10.4f} {100.0:>6.1f}% {self.nbars:>9} bars")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self, path=None):
+        """
+        Chrome trace (chrome://tracing, Perfetto) of every bar phase and
+        section call. Writes JSON to ``path`` when given; returns the dict.
+        """
+        events = []
+
+        for k, phase in enumerate(self.PHASES):
+            for bar in range(self.nbars):
+                events.append({
+                    "name": phase, "ph": "X", "pid": 0, "tid": 0,
+                    "ts": self.starts[bar, k] * 1e6, "dur": self.durations[bar, k] * 1e6,
+                    "args": {"bar": bar},
+                })
+
+        for name, start, dur in self.events:
+            events.append({
+                "name": name, "ph": "X", "pid": 0, "tid": 1,
+                "ts": start * 1e6, "dur": dur * 1e6,
+            })
+
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(trace, f)
+        return trace
@@ -0,0 +1,136 @@
+"""
+Declarative, first-match rule tables for strategy state machines.
+
+    RULES = RuleTable([
+        Rule(State.BULL, when=[[Cmp("spy", ">", "spy_ma200")]]),
+        Rule(State.OVERSOLD, when=[[Cmp("rsi_spy", "<", P("rsi_oversold"))]]),
+        Rule(State.DEFENSIVE),  # no conditions: always matches
+    ])
+
+``when`` is a list of groups: all groups must hold, and a group holds when
+any of its comparisons does. Operands name fields of a signals object
+(a namedtuple of scalars for one bar, or of arrays for the whole history);
+``P(name)`` reads a strategy param instead. ``because`` lists extra
+comparisons that only appear in the explanation (typically what is
+implied by the earlier rules failing).
+
+The same table runs per bar (``resolve``), over whole-history arrays with
+NumPy masks (``resolve_all``), and produces the explanation (``explain``).
+"""
+import operator
+
+import numpy as np
+
+_OPS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+class P:
+    """A strategy param operand (a threshold)."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Cmp:
+    def __init__(self, left, op, right):
+        if op not in _OPS:
+            raise ValueError(f"unknown comparison {op!r}")
+        self.left = left
+        self.op = op
+        self.right = right
+        self._fn = _OPS[op]
+
+    def _rhs(self, signals, params):
+        if isinstance(self.right, P):
+            return getattr(params, self.right.name)
+        return getattr(signals, self.right)
+
+    def test(self, signals, params):
+        """bool for scalar signals, boolean mask for array signals (NaN → False)."""
+        return self._fn(getattr(signals, self.left), self._rhs(signals, params))
+
+    def render(self, signals, params, labels):
+        lhs = f"{labels[self.left]}={getattr(signals, self.left):.1f}"
+
+        if isinstance(self.right, P):
+            rhs = f"{getattr(params, self.right.name)}"
+        else:
+            value = f"{getattr(signals, self.right):.1f}"
+            label = labels.get(self.right)
+            rhs = value if label is None else f"{label}={value}"
+
+        return f"{lhs}{self.op}{rhs}"
+
+
+class Rule:
+    def __init__(self, state, when=(), because=()):
+        self.state = state
+        self.when = [list(group) for group in when]
+        self.because = [list(group) for group in because]
+
+    def test(self, signals, params):
+        return all(
+            any(c.test(signals, params) for c in group)
+            for group in self.when
+        )
+
+    def mask(self, signals, params, n):
+        m = np.ones(n, dtype=bool)
+        for group in self.when:
+            any_of = np.zeros(n, dtype=bool)
+            for c in group:
+                any_of |= c.test(signals, params)
+            m &= any_of
+        return m
+
+
+class RuleTable:
+    def __init__(self, rules, labels=None):
+        """
+        rules: Rule list, first match wins; the last rule must have no
+        conditions so every bar resolves.
+        labels: signal name -> display name in explanations (None shows
+        the value alone, e.g. a moving average after its price).
+        """
+        self.rules = list(rules)
+        if not self.rules or self.rules[-1].when:
+            raise ValueError("the last rule must be unconditional")
+
+        self.labels = labels or {}
+        self.states = [r.state for r in self.rules]
+
+    def resolve(self, signals, params):
+        """The first matching rule for one bar of scalar signals."""
+        for rule in self.rules:
+            if rule.test(signals, params):
+                return rule
+
+    def resolve_all(self, signals, params):
+        """
+        Rule index per bar for signals holding whole-history arrays: one
+        mask per rule, first match wins. ``self.states[k]`` maps back.
+        """
+        n = len(getattr(signals, signals._fields[0]))
+        out = np.full(n, len(self.rules) - 1, dtype=np.int64)
+        open_ = np.ones(n, dtype=bool)
+
+        for k, rule in enumerate(self.rules[:-1]):
+            hit = rule.mask(signals, params, n) & open_
+            out[hit] = k
+            open_ &= ~hit
+
+        return out
+
+    def explain(self, rule, signals, params):
+        """One-line reason for ``rule`` on this bar."""
+        parts = [f"STATE={rule.state.name}"]
+        for group in rule.when + rule.because:
+            parts.append(
+                "(" + " OR ".join(c.render(signals, params, self.labels) for c in group) + ")"
+            )
+        return " ".join(parts)
@@ -1,7 +1,10 @@
 import mytrader as bt
+from collections import namedtuple
 from enum import Enum, auto
 from functions.inverted_holdings_logger import InvertedHoldingsLog
 from mytrader.mt_base_strategy import MTBaseStrategy
+from mytrader.rules import Cmp, P, Rule, RuleTable
+from mytrader.tradelog import DEBUG
 from functions.portfolio_reporting import log_monthly_deployed
 
 
@@ -16,12 +19,98 @@ class State(Enum):
     BEAR_DEFENSIVE_BSV = auto()
 
 
+Signals = namedtuple(
+    "Signals",
+    "spy spy_ma200 tqqq tqqq_ma20 rsi_tqqq rsi_spxl rsi_spy rsi_uvxy rsi_sqqq rsi_bsv",
+)
+
+# =========================
+# FSM rule table (first match wins)
+# =========================
+FTLT_RULES = RuleTable(
+    [
+        # 1️⃣ SPY above 200 SMA → bull regime
+        Rule(State.BULL_HEDGE_UVXY, when=[
+            [Cmp("spy", ">", "spy_ma200")],
+            [Cmp("rsi_tqqq", ">", P("rsi_tqqq_overbought")), Cmp("rsi_spxl", ">", P("rsi_spxl_overbought"))],
+        ]),
+        Rule(State.BULL_TQQQ, when=[
+            [Cmp("spy", ">", "spy_ma200")],
+        ], because=[
+            [Cmp("rsi_tqqq", "<", P("rsi_tqqq_overbought")), Cmp("rsi_spxl", "<", P("rsi_spxl_overbought"))],
+        ]),
+
+        # 2️⃣ Oversold tech
+        Rule(State.BEAR_OVERSOLD_TECH, when=[[Cmp("rsi_tqqq", "<", P("rsi_tqqq_oversold"))]]),
+
+        # 3️⃣ Oversold SPY
+        Rule(State.BEAR_OVERSOLD_SPXL, when=[[Cmp("rsi_spy", "<", P("rsi_spy_oversold"))]]),
+
+        # 4️⃣ Extreme volatility
+        Rule(State.BEAR_TQQQ_TREND, when=[
+            [Cmp("rsi_uvxy", ">", P("rsi_uvxy_extreme"))],
+            [Cmp("tqqq", ">", "tqqq_ma20")],
+        ]),
+        Rule(State.BEAR_DEFENSIVE_SQQQ, when=[
+            [Cmp("rsi_uvxy", ">", P("rsi_uvxy_extreme"))],
+            [Cmp("rsi_sqqq", ">", "rsi_bsv")],
+        ]),
+        Rule(State.BEAR_DEFENSIVE_BSV, when=[
+            [Cmp("rsi_uvxy", ">", P("rsi_uvxy_extreme"))],
+        ], because=[
+            [Cmp("rsi_bsv", ">=", "rsi_sqqq")],
+        ]),
+
+        # 5️⃣ Moderate volatility
+        Rule(State.BEAR_VOL_SPIKE, when=[[Cmp("rsi_uvxy", ">", P("rsi_uvxy_spike"))]]),
+
+        # 6️⃣ Trend fallback
+        Rule(State.BEAR_TQQQ_TREND, when=[[Cmp("tqqq", ">", "tqqq_ma20")]]),
+
+        # 7️⃣ Defensive fallback
+        Rule(State.BEAR_DEFENSIVE_SQQQ, when=[[Cmp("rsi_sqqq", ">", "rsi_bsv")]]),
+        Rule(State.BEAR_DEFENSIVE_BSV, because=[[Cmp("rsi_bsv", ">=", "rsi_sqqq")]]),
+    ],
+    labels=dict(
+        spy="SPY", spy_ma200=None, tqqq="TQQQ", tqqq_ma20=None,
+        rsi_tqqq="RSI_TQQQ", rsi_spxl="RSI_SPXL", rsi_spy="RSI_SPY",
+        rsi_uvxy="RSI_UVXY", rsi_sqqq="RSI_SQQQ", rsi_bsv="RSI_BSV",
+    ),
+)
+
+# State → asset held (100%)
+STATE_ASSETS = {
+    State.BULL_TQQQ: "TQQQ",
+    State.BULL_HEDGE_UVXY: "UVXY",
+    State.BEAR_OVERSOLD_TECH: "TECL",
+    State.BEAR_OVERSOLD_SPXL: "SPXL",
+    State.BEAR_VOL_SPIKE: "UVXY",
+    State.BEAR_TQQQ_TREND: "TQQQ",
+    State.BEAR_DEFENSIVE_SQQQ: "SQQQ",
+    State.BEAR_DEFENSIVE_BSV: "BSV",
+}
+
+
 class MT_TQQQFTLT_COC(MTBaseStrategy):
+    # for mytrader.fastpath
+    state_assets = STATE_ASSETS
+
+    # carried over by Cerebro checkpoints (with MTBaseStrategy's)
+    checkpoint_attrs = ("state", "start_portfolio_value", "prev_portfolio_value", "hlog")
+
     params = dict(
         rsi_period=10,
         ma200_period=200,
         ma20_period=20,
-        report="reports/mt_tqqq_ftlt_coc.html"
+        # -------- RSI thresholds --------
+        rsi_tqqq_overbought=79,
+        rsi_spxl_overbought=80,
+        rsi_tqqq_oversold=31,
+        rsi_spy_oversold=30,
+        rsi_uvxy_extreme=84,
+        rsi_uvxy_spike=74,
+        report="reports/mt_tqqq_ftlt_coc.html",  # None → no HTML report (sweeps)
+        fsm_mode="bar",  # "history" → resolve every bar's state up front with NumPy masks
     )
 
     def __init__(self):
@@ -53,162 +142,80 @@ class MT_TQQQFTLT_COC(MTBaseStrategy):
         self.rsi_bsv = bt.ind.RSI(self.bsv, period=self.p.rsi_period)
 
         self.state = None
+        self._rule_index = None
 
         # -------- Reporting --------
         self.start_portfolio_value = self.broker.getvalue()
         self.prev_portfolio_value = self.broker.getvalue()
         self.min_portfolio_value = self.broker.getvalue()
 
-        self.hlog = InvertedHoldingsLog(self.p.report)
-        self.hlog.clear()
+        self.hlog = None
+        if self.p.report is not None:
+            self.hlog = InvertedHoldingsLog(self.p.report)
+            self.hlog.clear()
 
     # =========================
-    # FSM Resolver
+    # Per-bar readings (shared by resolver and explanation log)
     # =========================
-    def resolve_state(self):
-        if self.spy.close[0] > self.spy_ma200[0]:
-            if self.rsi_tqqq[0] > 79 or self.rsi_spxl[0] > 80:
-                return State.BULL_HEDGE_UVXY
-            return State.BULL_TQQQ
-
-        if self.rsi_tqqq[0] < 31:
-            return State.BEAR_OVERSOLD_TECH
+    def signal_lines(self):
+        """The line / indicator behind each Signals field."""
+        return Signals(
+            spy=self.spy.close,
+            spy_ma200=self.spy_ma200,
+            tqqq=self.tqqq.close,
+            tqqq_ma20=self.tqqq_ma20,
+            rsi_tqqq=self.rsi_tqqq,
+            rsi_spxl=self.rsi_spxl,
+            rsi_spy=self.rsi_spy,
+            rsi_uvxy=self.rsi_uvxy,
+            rsi_sqqq=self.rsi_sqqq,
+            rsi_bsv=self.rsi_bsv,
+        )
+
+    @bt.perbar
+    def signals(self):
+        return Signals._make(line[0] for line in self.signal_lines())
 
-        if self.rsi_spy[0] < 30:
-            return State.BEAR_OVERSOLD_SPXL
-
-        if self.rsi_uvxy[0] > 84:
-            if self.tqqq.close[0] > self.tqqq_ma20[0]:
-                return State.BEAR_TQQQ_TREND
-            if self.rsi_sqqq[0] > self.rsi_bsv[0]:
-                return State.BEAR_DEFENSIVE_SQQQ
-            else:
-                return State.BEAR_DEFENSIVE_BSV
-
-        if self.rsi_uvxy[0] > 74:
-            return State.BEAR_VOL_SPIKE
-
-        if self.tqqq.close[0] > self.tqqq_ma20[0]:
-            return State.BEAR_TQQQ_TREND
+    # =========================
+    # FSM Resolver
+    # =========================
+    def resolve_rules(self):
+        """Rule index of every master bar, from whole-history arrays."""
+        history = Signals._make(self.history(line) for line in self.signal_lines())
+        return FTLT_RULES.resolve_all(history, self.p)
+
+    def resolve_states(self):
+        """State of every master bar, resolved in one vectorized pass."""
+        return [FTLT_RULES.states[k] for k in self.resolve_rules()]
+
+    @bt.perbar
+    def rule(self):
+        if self.p.fsm_mode == "history":
+            if self._rule_index is None:
+                self._rule_index = self.resolve_rules()
+            # bars streamed after the history resolve one at a time
+            if self.data.idx < len(self._rule_index):
+                return FTLT_RULES.rules[self._rule_index[self.data.idx]]
+
+        return FTLT_RULES.resolve(self.signals, self.p)
 
-        if self.rsi_sqqq[0] > self.rsi_bsv[0]:
-            return State.BEAR_DEFENSIVE_SQQQ
-        else:
-            return State.BEAR_DEFENSIVE_BSV
+    def resolve_state(self):
+        return self.rule.state
 
     def asset_for_state(self, state):
-        return {
-            State.BULL_TQQQ: self.tqqq,
-            State.BULL_HEDGE_UVXY: self.uvxy,
-            State.BEAR_OVERSOLD_TECH: self.tecl,
-            State.BEAR_OVERSOLD_SPXL: self.spxl,
-            State.BEAR_VOL_SPIKE: self.uvxy,
-            State.BEAR_TQQQ_TREND: self.tqqq,
-            State.BEAR_DEFENSIVE_SQQQ: self.sqqq,
-            State.BEAR_DEFENSIVE_BSV: self.bsv
-        }[state]
+        return self.getdatabyname(STATE_ASSETS[state])
 
     def log_state_resolution(self):
-        # 1️⃣ SPY above 200 SMA → bull regime
-        if self.spy.close[0] > self.spy_ma200[0]:
-            if self.rsi_tqqq[0] > 79 or self.rsi_spxl[0] > 80:
-                self.log(
-                    f"STATE=BULL_HEDGE_UVXY "
-                    f"(SPY={self.spy.close[0]:.1f}>{self.spy_ma200[0]:.1f}) "
-                    f"(RSI_TQQQ={self.rsi_tqqq[0]:.1f}>79 "
-                    f"OR RSI_SPXL={self.rsi_spxl[0]:.1f}>80)"
-                )
-                return
-            else:
-                self.log(
-                    f"STATE=BULL_TQQQ "
-                    f"(SPY={self.spy.close[0]:.1f}>{self.spy_ma200[0]:.1f})"
-                    f"(RSI_TQQQ={self.rsi_tqqq[0]:.1f}<79 "
-                    f"OR RSI_SPXL={self.rsi_spxl[0]:.1f}<80)"
-                )
-                return
-
-        # 2️⃣ Oversold tech
-        if self.rsi_tqqq[0] < 31:
-            self.log(
-                f"STATE=BEAR_OVERSOLD_TECH "
-                f"(RSI_TQQQ={self.rsi_tqqq[0]:.1f}<31)"
-            )
-            return
-
-        # 3️⃣ Oversold SPY
-        if self.rsi_spy[0] < 30:
-            self.log(
-                f"STATE=BEAR_OVERSOLD_SPXL "
-                f"(RSI_SPY={self.rsi_spy[0]:.1f}<30)"
-            )
-            return
-
-        # 4️⃣ Extreme volatility
-        if self.rsi_uvxy[0] > 84:
-            if self.tqqq.close[0] > self.tqqq_ma20[0]:
-                self.log(
-                    f"STATE=BEAR_TQQQ_TREND "
-                    f"(RSI_UVXY={self.rsi_uvxy[0]:.1f}>84) "
-                    f"(TQQQ={self.tqqq.close[0]:.1f}>{self.tqqq_ma20[0]:.1f})"
-                )
-                return
-
-            if self.rsi_sqqq[0] > self.rsi_bsv[0]:
-                self.log(
-                    f"STATE=BEAR_DEFENSIVE_SQQQ "
-                    f"(RSI_UVXY={self.rsi_uvxy[0]:.1f}>84) "
-                    f"(RSI_SQQQ={self.rsi_sqqq[0]:.1f}>"
-                    f"RSI_BSV={self.rsi_bsv[0]:.1f})"
-                )
-                return
-            else:
-                self.log(
-                    f"STATE=BEAR_DEFENSIVE_BSV "
-                    f"(RSI_UVXY={self.rsi_uvxy[0]:.1f}>84) "
-                    f"(RSI_BSV={self.rsi_bsv[0]:.1f}>="
-                    f"RSI_SQQQ={self.rsi_sqqq[0]:.1f})"
-                )
-                return
-
-        # 5️⃣ Moderate volatility
-        if self.rsi_uvxy[0] > 74:
-            self.log(
-                f"STATE=BEAR_VOL_SPIKE "
-                f"(RSI_UVXY={self.rsi_uvxy[0]:.1f}>74)"
-            )
+        # explanations only: skip all the formatting when nobody reads them
+        if not self.log_enabled(DEBUG):
             return
 
-        # 6️⃣ Trend fallback
-        if self.tqqq.close[0] > self.tqqq_ma20[0]:
-            self.log(
-                f"STATE=BEAR_TQQQ_TREND "
-                f"(TQQQ={self.tqqq.close[0]:.1f}>{self.tqqq_ma20[0]:.1f})"
-            )
-            return
-
-        # 7️⃣ Defensive fallback
-        if self.rsi_sqqq[0] > self.rsi_bsv[0]:
-            self.log(
-                f"STATE=BEAR_DEFENSIVE_SQQQ "
-                f"(RSI_SQQQ={self.rsi_sqqq[0]:.1f}>"
-                f"RSI_BSV={self.rsi_bsv[0]:.1f})"
-            )
-            return
-        else:
-            self.log(
-                f"STATE=BEAR_DEFENSIVE_BSV "
-                f"(RSI_BSV={self.rsi_bsv[0]:.1f}>="
-                f"RSI_SQQQ={self.rsi_sqqq[0]:.1f})"
-            )
-            return
+        self.debug(FTLT_RULES.explain(self.rule, self.signals, self.p))
 
     # =========================
     # Main loop (DAILY, SAME-BAR SWAP)
     # =========================
     def next(self):
-        self._update_drawdown()  # 👈 base infra
-
         if not self.trading_allowed():
             return
 
@@ -218,21 +225,24 @@ class MT_TQQQFTLT_COC(MTBaseStrategy):
         # -------- REBALANCE USING CURRENT HOLDINGS (NO "current_asset" VAR) --------
         held_assets = [d for d in self.ALL_ASSETS if self.getposition(d).size != 0]
 
-        self.log_state_resolution()
+        with self.section("log_state_resolution"):
+            self.log_state_resolution()
 
-        growth_pct = ((self.broker.getvalue() - self.prev_portfolio_value) / self.prev_portfolio_value) * 100
-        total_growth_pct = ((self.broker.getvalue() - self.start_portfolio_value) / self.start_portfolio_value) * 100
+        growth_pct = ((self.portfolio_value - self.prev_portfolio_value) / self.prev_portfolio_value) * 100
+        total_growth_pct = ((self.portfolio_value - self.start_portfolio_value) / self.start_portfolio_value) * 100
 
-        self.hlog.collect(self,
-                          assets=["CASH"] + self.ALL_ASSETS,
-                          change=f"{growth_pct:+.2f}%",
-                          value=f"{total_growth_pct:+,.1f}%",
-                          notes=f"{next_state.name.replace('STATE', '')}"
-                          )
+        if self.hlog is not None:
+            with self.section("hlog.collect"):
+                self.hlog.collect(self,
+                                  assets=["CASH"] + self.ALL_ASSETS,
+                                  change=growth_pct,
+                                  value=total_growth_pct,
+                                  notes=next_state.name.replace('STATE', '')
+                                  )
 
         # -------- STATE CHANGE → TARGET REBALANCE --------
         if next_state != self.state:
-            self.log(f"STATE CHANGE: {self.state} → {next_state}")
+            self.log(lambda: f"STATE CHANGE: {self.state} → {next_state}")
 
             #  Do nothing if asset is held already
             if len(held_assets) == 1 and held_assets[0] is next_asset:
@@ -251,12 +261,16 @@ class MT_TQQQFTLT_COC(MTBaseStrategy):
 
             # Set target asset
             self.order_target_percent(next_asset, 1.0)
-            self.log(f"ENTER {next_asset._name} @ 100% | DECISION OHLC O:{o:,.2f} H:{h:,.2f} L:{l:,.2f} C:{c:,.2f}")
+            self.log(lambda: f"ENTER {next_asset._name} @ 100% | DECISION OHLC O:{o:,.2f} H:{h:,.2f} L:{l:,.2f} C:{c:,.2f}")
 
             self.state = next_state
 
-        log_monthly_deployed(strategy=self)
-        self.log('')
+        with self.section("log_monthly_deployed"):
+            log_monthly_deployed(strategy=self)
+        self.debug('')
 
     def stop(self):
-        self.hlog.write()
+        super().stop()  # 👈 base infra (drawdown)
+
+        if self.hlog is not None:
+            self.hlog.write()
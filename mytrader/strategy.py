@@ -1,24 +1,142 @@
+import functools
+from contextlib import nullcontext
+
+import numpy as np
+
 from .order import Order
 
+
+def perbar(func):
+    """
+    Read-only property computed at most once per bar:
+
+        @perbar
+        def portfolio_value(self):
+            return self.broker.getvalue()
+
+    The memo is keyed on the master data's current index, so it is dropped
+    automatically when the clock advances.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def getter(self):
+        bar = self.data.idx
+        if self._perbar_bar != bar:
+            self._perbar_bar = bar
+            self._perbar_memo = {}
+
+        memo = self._perbar_memo
+        if name not in memo:
+            memo[name] = func(self)
+        return memo[name]
+
+    return property(getter)
+
+
+class Params:
+    """Strategy params as attributes (``self.p.period``)."""
+
+    def __init__(self, **params):
+        self.__dict__.update(params)
+
+    def __repr__(self):
+        return f"Params({', '.join(f'{k}={v!r}' for k, v in self.__dict__.items())})"
+
+
 class AnalyzerCollection(dict):
     def getbyname(self, name):
         return self[name]
 
 class Strategy:
     params = {}
+
+    # BarProfiler, set by Cerebro.run(profile=True)
+    _profiler = None
+
+    # TradeLogger, set by Cerebro.run
+    logger = None
+
+    # @perbar memo: bar it belongs to, values by name
+    _perbar_bar = None
+
+    # attributes Cerebro.checkpoint saves, on top of those of the base classes
+    checkpoint_attrs = ()
+
     def __init__(self, **kwargs):
-        self.p = type("Params", (), self.params | kwargs)()
+        self.p = Params(**(self.params | kwargs))
+
+    # broker value after every bar, recorded by Cerebro
+    equity = None
+    _equity_len = 0
+
+    def _init_equity(self, nbars):
+        self.equity = np.empty(nbars, dtype=np.float64)
+        self._equity_len = 0
+
+    def _after_bar(self):
+        """Called by Cerebro.push once a streamed bar's equity is recorded."""
+
+    def _grow_equity(self, nbars):
+        # streamed bars: double the buffer when full
+        if nbars > len(self.equity):
+            grown = np.empty(max(2 * len(self.equity), nbars), dtype=np.float64)
+            grown[:self._equity_len] = self.equity[:self._equity_len]
+            self.equity = grown
 
     def _init_analyzers(self, analyzers):
         self.analyzers = AnalyzerCollection()
-        for name, cls in analyzers:
-            inst = cls(self)
+        for name, cls, kwargs in analyzers:
+            inst = cls(self, **kwargs)
             if name:
                 self.analyzers[name] = inst
 
+        # only these are called every bar
+        self._bar_analyzers = [
+            (name, a) for name, a in self.analyzers.items()
+            if not getattr(a, "vectorized", False)
+        ]
+
     def __len__(self):
         return len(self.data)
 
+    def getstate(self):
+        """The checkpoint_attrs of this class and its bases, by name."""
+        names = dict.fromkeys(
+            name
+            for cls in reversed(type(self).__mro__)
+            for name in vars(cls).get("checkpoint_attrs", ())
+        )
+        return {name: getattr(self, name) for name in names if hasattr(self, name)}
+
+    def setstate(self, state):
+        """Restore getstate() output (Cerebro.resume, after __init__)."""
+        self.__dict__.update(state)
+
+    def _start_indicators(self):
+        # precompute indicators registered during __init__
+        for ind in getattr(self, "_indicators", []):
+            ind._start()
+
+    def section(self, name):
+        """Time a block under ``name`` when profiling (no-op otherwise)."""
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.section(name)
+
+    def history(self, line):
+        """
+        What ``line[0]`` reads on every master bar, as one array (NaN before
+        the line's data starts). ``line`` is a data line or an indicator;
+        available once Cerebro.run has aligned the feeds.
+        """
+        rows = self.cerebro.alignment[:, self.datas.index(line.data)]
+        values = np.asarray(line.array, dtype=float)
+
+        out = values[np.maximum(rows, 0)] if len(values) else np.full(len(rows), np.nan)
+        out[rows < 0] = np.nan
+        return out
+
     def getdatabyname(self, name):
         return self.cerebro.datasbyname[name]
 
@@ -0,0 +1,89 @@
+"""
+Strategy logging: verbosity levels, lazy messages, buffered output.
+
+    SILENT  nothing is formatted or written
+    INFO    trades, state changes, gates
+    DEBUG   per-bar detail (state explanations, position lines)
+
+A message may be a callable returning the text; it is only called when the
+level is enabled. Lines go to a BufferedSink that writes in batches.
+"""
+import sys
+
+SILENT, INFO, DEBUG = 0, 1, 2
+
+
+class BufferedSink:
+    """
+    Collects lines and writes them ``batch`` at a time to a stream
+    (default stdout) or to a file path (truncated when first written).
+    """
+
+    def __init__(self, target=None, batch=512):
+        self.target = target
+        self.batch = batch
+        self._buffer = []
+        self._stream = None
+
+    def write(self, line):
+        self._buffer.append(line)
+        if len(self._buffer) >= self.batch:
+            self.flush()
+
+    def _open(self):
+        if self._stream is None:
+            if self.target is None:
+                self._stream = sys.stdout
+            elif isinstance(self.target, str):
+                self._stream = open(self.target, "w", encoding="utf-8")
+            else:
+                self._stream = self.target
+        return self._stream
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        stream = self._open()
+        stream.write("\n".join(self._buffer) + "\n")
+        stream.flush()
+        self._buffer.clear()
+
+    def close(self):
+        self.flush()
+        if isinstance(self.target, str):
+            # a run that logged nothing still replaces the previous file
+            self._open().close()
+            self._stream = None
+
+
+class TradeLogger:
+    def __init__(self, level=DEBUG, sink=None, keep_lines=None):
+        """
+        keep_lines: also keep every line in ``self.lines``; by default only
+        when the sink writes to stdout (a logfile already holds them).
+        """
+        self.level = level
+        self.sink = BufferedSink() if sink is None else sink
+        if keep_lines is None:
+            keep_lines = self.sink.target is None
+        self.lines = [] if keep_lines else None
+
+    def enabled(self, level=INFO):
+        return level <= self.level
+
+    def log(self, msg, dt, level=INFO):
+        if level > self.level:
+            return
+
+        if callable(msg):
+            msg = msg()
+
+        line = f"{dt:%Y-%m-%d}, {msg}"
+
+        if self.lines is not None:
+            self.lines.append(line)
+        self.sink.write(line)
+
+    def flush(self):
+        self.sink.flush()
@@ -0,0 +1,74 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mytrader as bt
+from mytrader import fastpath
+from mytrader.strategies.mt_tqqq_ftlt_coc import MT_TQQQFTLT_COC
+from mytrader.tradelog import SILENT
+
+TICKERS = ["SPY", "TQQQ", "SPXL", "UVXY", "TECL", "SQQQ", "BSV"]
+
+
+def synthetic_frames(nbars=900, seed=0):
+    """Random walks with uneven volatility, a late-listed UVXY and a gap in SQQQ."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2011-01-03", periods=nbars, name="datetime")
+    frames = {}
+    for k, ticker in enumerate(TICKERS):
+        close = 50.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.01 * (1 + k % 4), nbars)))
+        frames[ticker] = pd.DataFrame(
+            dict(open=close, high=close * 1.01, low=close * 0.99, close=close, volume=1e6),
+            index=index,
+        )
+    frames["UVXY"] = frames["UVXY"].iloc[30:]
+    frames["SQQQ"] = frames["SQQQ"].drop(frames["SQQQ"].index[100:110])
+    return frames
+
+
+def make_cerebro(frames, **params):
+    cerebro = bt.Cerebro(loglevel=SILENT)
+    for ticker, df in frames.items():
+        cerebro.adddata(bt.feeds.PandasData(df), name=ticker)
+    cerebro.addstrategy(MT_TQQQFTLT_COC, report=None, trade_start=date(2011, 11, 1), **params)
+    return cerebro
+
+
+@pytest.mark.parametrize("fsm_mode", ["bar", "history"])
+@pytest.mark.parametrize("thresholds", [
+    {},
+    dict(rsi_period=8, rsi_tqqq_overbought=70, rsi_tqqq_oversold=35, rsi_uvxy_spike=65),
+])
+def test_fastpath_matches_cerebro_run(fsm_mode, thresholds):
+    cerebro = make_cerebro(synthetic_frames(), fsm_mode=fsm_mode, **thresholds)
+
+    ok, fast, event = fastpath.check_parity(cerebro)
+
+    assert ok
+    assert len(fast.trades) > 0
+
+
+def test_fast_sweep_checks_parity_first():
+    cerebro = make_cerebro(synthetic_frames())
+    cerebro.optstrategy(MT_TQQQFTLT_COC, report=None, trade_start=date(2011, 11, 1), rsi_period=[8, 10])
+    fast = cerebro.run(maxcpus=1, fast=True)
+
+    cerebro.optstrategy(MT_TQQQFTLT_COC, report=None, trade_start=date(2011, 11, 1), rsi_period=[8, 10])
+    slow = cerebro.run(maxcpus=1)
+
+    pd.testing.assert_frame_equal(fast, slow)
+
+
+class _WrongAssets(MT_TQQQFTLT_COC):
+    # fastpath trades another asset than next() does
+    state_assets = {state: "BSV" for state in MT_TQQQFTLT_COC.state_assets}
+
+
+def test_fast_sweep_rejects_a_divergent_fast_path():
+    cerebro = make_cerebro(synthetic_frames())
+    cerebro.optstrategy(_WrongAssets, report=None, trade_start=date(2011, 11, 1), rsi_period=[8, 10])
+
+    with pytest.raises(RuntimeError, match="fastpath diverges"):
+        cerebro.run(maxcpus=1, fast=True)
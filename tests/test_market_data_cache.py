@@ -0,0 +1,127 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from functions.data_sources import DataSource
+from functions.download_with_retry import download_with_retry
+from functions.market_data_cache import MarketDataCache
+
+
+class StubSource(DataSource):
+    """Business-day bars; the first ``flaky`` calls return an empty frame, like Ticker.history on a transient error."""
+
+    def __init__(self, flaky=0):
+        self.flaky = flaky
+        self.calls = []
+
+    def fetch(self, ticker, start, end):
+        self.calls.append((pd.Timestamp(start).date(), pd.Timestamp(end).date()))
+        index = pd.bdate_range(start, end, name="datetime")
+        if self.flaky:
+            self.flaky -= 1
+            index = index[:0]
+        close = np.arange(len(index), dtype=np.float64) + 100.0
+        return pd.DataFrame(
+            dict(open=close, high=close, low=close, close=close, volume=1.0),
+            index=index,
+        )
+
+
+def download(source, cache_dir, start, end):
+    return download_with_retry(["SPY"], start, end, retry_delay_sec=0, cache_dir=cache_dir, source=source)
+
+
+def test_initial_fetch_retries_an_empty_response(tmp_path):
+    source = StubSource(flaky=1)
+
+    df = download(source, tmp_path, "2024-01-01", "2024-01-31")["SPY"]
+
+    assert len(source.calls) == 2
+    assert len(df) == len(pd.bdate_range("2024-01-01", "2024-01-31"))
+    assert MarketDataCache(tmp_path).coverage("SPY") == (date(2024, 1, 1), date(2024, 1, 31))
+
+
+def test_empty_top_up_is_refetched(tmp_path):
+    download(StubSource(), tmp_path, "2024-01-01", "2024-01-31")
+
+    # transient empty response: the tail stays uncovered
+    download(StubSource(flaky=1), tmp_path, "2024-01-01", "2024-03-15")
+    assert MarketDataCache(tmp_path).coverage("SPY") == (date(2024, 1, 1), date(2024, 1, 31))
+
+    source = StubSource()
+    df = download(source, tmp_path, "2024-01-01", "2024-03-15")["SPY"]
+
+    assert source.calls == [(date(2024, 2, 1), date(2024, 3, 15))]
+    assert len(df) == len(pd.bdate_range("2024-01-01", "2024-03-15"))
+    assert MarketDataCache(tmp_path).coverage("SPY") == (date(2024, 1, 1), date(2024, 3, 15))
+
+
+def test_short_top_up_covers_up_to_last_bar(tmp_path):
+    download(StubSource(), tmp_path, "2024-01-01", "2024-01-31")
+
+    class ShortSource(StubSource):
+        def fetch(self, ticker, start, end):
+            return super().fetch(ticker, start, "2024-02-09")
+
+    download(ShortSource(), tmp_path, "2024-01-01", "2024-02-29")
+    assert MarketDataCache(tmp_path).coverage("SPY") == (date(2024, 1, 1), date(2024, 2, 9))
+
+    source = StubSource()
+    df = download(source, tmp_path, "2024-01-01", "2024-02-29")["SPY"]
+
+    assert source.calls == [(date(2024, 2, 10), date(2024, 2, 29))]
+    assert len(df) == len(pd.bdate_range("2024-01-01", "2024-02-29"))
+
+
+def test_weekend_gap_counts_as_covered(tmp_path):
+    # 2024-02-03/04 is a weekend: nothing left to fetch after Friday's bar
+    download(StubSource(), tmp_path, "2024-01-01", "2024-02-04")
+    assert MarketDataCache(tmp_path).coverage("SPY") == (date(2024, 1, 1), date(2024, 2, 4))
+
+    source = StubSource()
+    download(source, tmp_path, "2024-01-01", "2024-02-04")
+    assert source.calls == []
+
+
+class ListedSource(StubSource):
+    """No bars before ``listed``."""
+
+    def __init__(self, listed):
+        super().__init__()
+        self.listed = pd.Timestamp(listed)
+
+    def fetch(self, ticker, start, end):
+        df = super().fetch(ticker, max(pd.Timestamp(start), self.listed), end)
+        return df[df.index >= self.listed]
+
+
+def test_head_before_listing_is_covered_and_tail_still_tops_up(tmp_path):
+    download(ListedSource("2024-01-02"), tmp_path, "2024-01-02", "2024-01-31")
+
+    # start moved before the listing: the empty head no longer blocks the top-up
+    source = ListedSource("2024-01-02")
+    df = download(source, tmp_path, "2023-12-01", "2024-02-29")["SPY"]
+
+    assert len(df) == len(pd.bdate_range("2024-01-02", "2024-02-29"))
+    assert MarketDataCache(tmp_path).coverage("SPY") == (date(2023, 12, 1), date(2024, 2, 29))
+
+    # ... and is not fetched again
+    source = ListedSource("2024-01-02")
+    download(source, tmp_path, "2023-12-01", "2024-02-29")
+    assert source.calls == []
+
+
+def test_failed_head_does_not_block_the_tail(tmp_path):
+    download(StubSource(), tmp_path, "2024-01-01", "2024-01-31")
+
+    class HeadFails(StubSource):
+        def fetch(self, ticker, start, end):
+            if pd.Timestamp(start) < pd.Timestamp("2024-01-01"):
+                raise ConnectionError("down")
+            return super().fetch(ticker, start, end)
+
+    df = download(HeadFails(), tmp_path, "2023-12-01", "2024-02-29")["SPY"]
+
+    assert len(df) == len(pd.bdate_range("2024-01-01", "2024-02-29"))
+    assert MarketDataCache(tmp_path).coverage("SPY") == (date(2024, 1, 1), date(2024, 2, 29))